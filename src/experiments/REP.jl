@@ -159,6 +159,8 @@ function REP_cache_fig5(cliargs::Dict, mp_file::String; enum_bound=1,perm_bound=
 end
 
 function REP_cache_fig6(cliargs::Dict, mp_file::String; run_enum=true,run_perm=true)
+    cliargs["sweep"] && return REP_sweep_fig6(cliargs, mp_file; run_enum=run_enum, run_perm=run_perm)
+
     k = cliargs["budget"]
     percent_changes = 1.0:-0.05:0.0
 
@@ -273,6 +275,67 @@ function REP_cache_fig6(cliargs::Dict, mp_file::String; run_enum=true,run_perm=t
 
 end
 
+"""
+same rows as REP_cache_fig6, with the case parsed once; every strategy solves
+the same load perturbation of a repeat (see sweep_scenarios)
+"""
+function REP_sweep_fig6(cliargs::Dict, mp_file::String; run_enum=true,run_perm=true)
+    k = cliargs["budget"]
+    percent_changes = 1.0:-0.05:0.0
+
+    cliargs["iterline_budget"] = 1
+    cliargs["line_budget"] = k
+
+    fcache = cliargs["output_path"] * "cache/" * first(split(cliargs["case"], ".")) * "_exp2_k$(k).csv"
+    open(fcache, "w") do f
+        # Write header
+        write(f, "k,percent_change,problem,load_shed,permutation\n")
+
+        function write_solutions(pc, problem, soln)
+            for (po, s) in soln.solution.solutions
+                porder_str = join([join(o, "/") for o in po], ";")
+                write(f, "$(k),$(pc),$(problem),$(s.load_shed),$(porder_str)\n")
+                flush(f)
+            end
+        end
+
+        sweep_scenarios(cliargs, mp_file, percent_changes) do args, data, ref, pc
+            # Get traditional solution
+            trad_soln = solve_traditional(args, data, ref)
+            ls = trad_soln.solution.load_shed
+            l_str = join(trad_soln.solution.lines, ";")
+            write(f, "$(k),$(pc),standard,$(ls),$(l_str)\n")
+            flush(f)
+
+            # Get permutation solutions - with the same traditional solution
+            if run_perm
+                args["failed"] = join(trad_soln.solution.lines, ",")
+                write_solutions(pc, "permutation", solve_permutation(args, data, ref))
+                args["failed"] = ""
+            end
+
+            # Get enumeration solutions
+            if run_enum && !args["no_enum"]
+                write_solutions(pc, "enumeration", solve_enumeration(args, data, ref))
+            end
+
+            # Get the greedy solutions
+            try
+                write_solutions(pc, "greedy_flow", solve_greedy_flow(args, data, ref))
+            catch end
+            try
+                write_solutions(pc, "greedy_impt", solve_greedy_impact(args, data, ref))
+            catch end
+            try
+                write_solutions(pc, "greedy_crit", solve_greedy_criticality(args, data, ref))
+            catch end
+
+            # Get our solution
+            write_solutions(pc, "sequin", solve_approach(args, data, ref))
+        end
+    end
+end
+
 function REP_cache_tab2(cliargs::Dict, mp_file::String)
     ks = [3,4]
     percent_changes = 1.0:-0.05:0.0
@@ -0,0 +1,111 @@
+# dc-ls-islands.jl
+#
+# Closed-form solutions of the islands of an interdicted case. An island with a
+# single bus has no flows, so its load shed only depends on its load and on the
+# range of its generation; such islands are solved without the load shed model,
+# which then only has to solve the remaining islands.
+
+""" data class that holds a connected component of the active network """
+struct Island
+    buses::Vector{Int}
+    branches::Vector{Int}
+    gens::Vector{Int}
+    loads::Vector{Int}
+    shunts::Vector{Int}
+end
+
+""" connected components of the active buses and branches of ref """
+function get_islands(ref::Dict, status::TopologyStatus)
+    adjacent = Dict(i => Tuple{Int,Int}[] for i in keys(ref[:bus]) if status.bus[i])
+    for (l, branch) in ref[:branch]
+        status.branch[l] || continue
+        push!(adjacent[branch["f_bus"]], (l, branch["t_bus"]))
+        push!(adjacent[branch["t_bus"]], (l, branch["f_bus"]))
+    end
+
+    islands = Island[]
+    seen = Set{Int}()
+    for root in sort(collect(keys(adjacent)))
+        in(root, seen) && continue
+        push!(seen, root)
+
+        island = Island([root], [], [], [], [])
+        Q = [root]
+        while !isempty(Q)
+            v = pop!(Q)
+            for (l, w) in adjacent[v]
+                # Each branch is seen from both ends; keep it at its from bus
+                (ref[:branch][l]["f_bus"] == v) && push!(island.branches, l)
+                in(w, seen) && continue
+                push!(seen, w)
+                push!(island.buses, w)
+                push!(Q, w)
+            end
+        end
+
+        for i in island.buses
+            append!(island.gens, [g for g in ref[:bus_gens][i] if status.gen[g]])
+            append!(island.loads, [d for d in ref[:bus_loads][i] if status.load[d]])
+            append!(island.shunts, [s for s in ref[:bus_shunts][i] if status.shunt[s]])
+        end
+        push!(islands, island)
+    end
+
+    return islands
+end
+
+"""
+Served loads and dispatch of a single-bus island, given the (lower, upper)
+limits of its generators and the demand of its loads. Return nothing if the
+island needs the load shed model: it has branches or shunts, or its load is
+below the lower limits (so generators would have to be switched off)
+"""
+function solve_island_closed_form(island::Island, limits::Dict, pd::Dict)
+    (length(island.buses) != 1 || !isempty(island.shunts)) && return nothing
+
+    load = sum(pd[i] for i in island.loads; init=0.0)
+    lo = sum(limits[g][1] for g in island.gens; init=0.0)
+    hi = sum(limits[g][2] for g in island.gens; init=0.0)
+    (load < lo) && return nothing
+
+    # All generators stay on at the same fraction of their range
+    served = min(load, hi)
+    t = (hi > lo) ? (served - lo) / (hi - lo) : 0.0
+    pg = Dict(g => limits[g][1] + t * (limits[g][2] - limits[g][1])
+              for g in island.gens)
+
+    # Any split of a deficit among the loads is optimal; shed it proportionally
+    z = (load > 0.0) ? served / load : 1.0
+    loads = Dict(i => z * pd[i] for i in island.loads)
+
+    return (loads=loads, pg=pg)
+end
+
+"""
+Solve the islands of ref that have a closed form, and mark their components
+inactive in status so the load shed model skips them. Returns the served
+loads and dispatch of those islands
+"""
+function solve_islands_closed_form!(status::TopologyStatus, ref::Dict,
+    limits::Dict, pd::Dict)
+    loads, pg = Dict{Int,Float64}(), Dict{Int,Float64}()
+    for island in get_islands(ref, status)
+        solution = solve_island_closed_form(island, limits, pd)
+        (solution === nothing) && continue
+        merge!(loads, solution.loads)
+        merge!(pg, solution.pg)
+        set_island_status!(status, island, false)
+    end
+    return (loads=loads, pg=pg)
+end
+
+""" set the status of all components of an island """
+function set_island_status!(status::TopologyStatus, island::Island, on::Bool)
+    for (active, ids) in ((status.bus, island.buses), (status.branch, island.branches),
+                          (status.gen, island.gens), (status.load, island.loads),
+                          (status.shunt, island.shunts))
+        for i in ids
+            active[i] = on
+        end
+    end
+end
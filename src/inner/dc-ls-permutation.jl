@@ -1,23 +1,41 @@
 """ Get load shed and power flow solution on interdictable components"""
 function get_permutation_inner_solution(data, ref,
     generators::Vector, lines::Vector, it_data::IterData;
-    percent_change=0.1, solver="cplex")::NamedTuple
+    percent_change=0.1, solver="cplex", persistent=true, cache=true)::NamedTuple
 
-    # Turn off lines/generators and propagate topology
-    case = interdict_components(data, generators, lines; make_deepcopy=true)
+    # Return the memoized solution if this state was solved before
+    if cache
+        key = inner_cache_key(:permutation, data, ref, generators, lines,
+            it_data.prev_gen_setpoints, it_data.prev_loads,
+            percent_change, solver, persistent)
+        return get!(INNER_CACHE, key) do
+            get_permutation_inner_solution(data, ref, generators, lines, it_data;
+                percent_change=percent_change, solver=solver,
+                persistent=persistent, cache=false)
+        end
+    end
 
-    lp_optimizer = get_lp_optimizer(solver)
-
-    setpoints = it_data.prev_gen_setpoints
-    loads = it_data.prev_loads
+    # Turn off lines/generators; the overlay avoids deepcopying the case
+    case = interdict_components(data, generators, lines;
+        topology=it_data.topology)
+    modify_setpoints!(case, it_data.prev_gen_setpoints)
 
     # Ensure that you cannot recover lost load
-    modify_loads!(case, loads)
+    modify_loads!(case, it_data.prev_loads)
+
+    # Re-parameterize the case's persistent model instead of rebuilding it
+    if persistent
+        return with_inner_model(data, ref, solver) do im
+            solve_inner_model!(im, case; percent_change=percent_change)
+        end
+    end
 
     # Solve once to get max load shed
-    pm = instantiate_model(deepcopy(case), DCPPowerModel,
-        (pm) -> my_build_mld(pm, setpoints; percent_change=percent_change))
-    result = optimize_model!(pm, optimizer=lp_optimizer)
+    pm = instantiate_model(materialize(case), DCPPowerModel,
+        (pm) -> my_build_mld(pm, case.setpoints; percent_change=percent_change))
+    result = with_lp_optimizer(solver) do lp_optimizer
+        optimize_model!(pm, optimizer=lp_optimizer)
+    end
 
     # Solve again to get min fuel cost, given solutions with max load shed
     # load_served = sum(load["pd"] for (_, load) in result["solution"]["load"])
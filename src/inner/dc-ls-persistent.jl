@@ -0,0 +1,285 @@
+# dc-ls-persistent.jl
+#
+# Persistent version of the (DC) load shed model in pm_model.jl. The model is
+# built once per case; an interdiction is applied by changing bounds,
+# coefficients and right-hand sides instead of re-instantiating the model.
+
+""" data class that holds the persistent inner model of a case """
+mutable struct InnerModel
+    model::JuMP.Model
+    ref::Dict
+    total_load::Float64
+
+    # Constraints that are modified between solves
+    balance::Dict{Int,ConstraintRef}
+    ohms::Dict{Int,ConstraintRef}
+    angmax::Dict{Int,ConstraintRef}
+    angmin::Dict{Int,ConstraintRef}
+    gen_ub::Dict{Int,ConstraintRef}
+    gen_lb::Dict{Int,ConstraintRef}
+
+    # State that is currently applied to the model
+    status::TopologyStatus
+    branch_status::Dict{Int,Bool}
+    gen_limits::Dict{Int,Tuple{Float64,Float64}}
+    load_pd::Dict{Int,Float64}
+end
+
+""" build the load shed model of my_build_mld (DCPPowerModel) for a case """
+function build_inner_model(ref::Dict, total_load::Float64, solver::String)
+    # Keeps a pooled Gurobi environment for as long as the case keeps the model
+    model = direct_model(MOI.instantiate(get_lp_optimizer(solver)))
+
+    @variable(model, va[i in keys(ref[:bus])])
+    @variable(model, p[l in keys(ref[:branch])])
+    @variable(model, pg[i in keys(ref[:gen])])
+    @variable(model, z_gen[i in keys(ref[:gen])], Bin)
+    @variable(model, 0 <= z_demand[i in keys(ref[:load])] <= 1)
+    @variable(model, 0 <= z_shunt[i in keys(ref[:shunt])] <= 1)
+
+    @objective(model, Max,
+        sum(z_shunt[i] for i in keys(ref[:shunt]); init=0.0) +
+        sum(abs(load["pd"]) * z_demand[i] for (i, load) in ref[:load]; init=0.0)
+    )
+
+    for i in keys(ref[:ref_buses])
+        @constraint(model, va[i] == 0)
+    end
+
+    # Power balance at each bus (the to-side flow is -p in the DC model)
+    balance = Dict{Int,ConstraintRef}()
+    for i in keys(ref[:bus])
+        flow, injection = AffExpr(0.0), AffExpr(0.0)
+        for (l, f_bus, _) in ref[:bus_arcs][i]
+            sign = ref[:branch][l]["f_bus"] == f_bus ? 1.0 : -1.0
+            add_to_expression!(flow, sign, p[l])
+        end
+        for g in ref[:bus_gens][i]
+            add_to_expression!(injection, 1.0, pg[g])
+        end
+        for l in ref[:bus_loads][i]
+            add_to_expression!(injection, -ref[:load][l]["pd"], z_demand[l])
+        end
+        for s in ref[:bus_shunts][i]
+            add_to_expression!(injection, -ref[:shunt][s]["gs"], z_shunt[s])
+        end
+        balance[i] = @constraint(model, flow == injection)
+    end
+
+    # Ohm's law and angle difference; relaxed when the branch is turned off
+    ohms = Dict{Int,ConstraintRef}()
+    angmax = Dict{Int,ConstraintRef}()
+    angmin = Dict{Int,ConstraintRef}()
+    for (l, branch) in ref[:branch]
+        f_bus, t_bus = branch["f_bus"], branch["t_bus"]
+        ohms[l] = @constraint(model,
+            branch["br_x"] * branch["tap"] * p[l] - va[f_bus] + va[t_bus]
+            ==
+            -branch["shift"])
+        angmax[l] = @constraint(model, va[f_bus] - va[t_bus] <= branch["angmax"])
+        angmin[l] = @constraint(model, va[f_bus] - va[t_bus] >= branch["angmin"])
+        _set_branch_flow_bounds!(p[l], branch, true)
+    end
+
+    # Generator on/off constraints; limits are set in update_inner_model!
+    gen_ub = Dict{Int,ConstraintRef}()
+    gen_lb = Dict{Int,ConstraintRef}()
+    for (i, gen) in ref[:gen]
+        JuMP.set_lower_bound(pg[i], gen["pmin"])
+        JuMP.set_upper_bound(pg[i], gen["pmax"])
+        gen_ub[i] = @constraint(model, pg[i] - gen["pmax"] * z_gen[i] <= 0)
+        gen_lb[i] = @constraint(model, pg[i] - gen["pmin"] * z_gen[i] >= 0)
+    end
+
+    return InnerModel(model, ref, total_load,
+        balance, ohms, angmax, angmin, gen_ub, gen_lb,
+        TopologyStatus(
+            Dict(i => true for i in keys(ref[:bus])),
+            Dict(l => true for l in keys(ref[:branch])),
+            Dict(i => true for i in keys(ref[:gen])),
+            Dict(i => true for i in keys(ref[:load])),
+            Dict(i => true for i in keys(ref[:shunt]))),
+        Dict(l => true for l in keys(ref[:branch])),
+        Dict(i => (gen["pmin"], gen["pmax"]) for (i, gen) in ref[:gen]),
+        Dict(i => load["pd"] for (i, load) in ref[:load]))
+end
+
+"""
+Check out a persistent inner model of the case (building one if none is free),
+call f on it and return it to the pool. Each concurrent caller (e.g., a thread)
+gets a model, and a solver environment, of its own.
+"""
+function with_inner_model(f::Function, data, ref, solver)
+    # Kept in ref so that the models live exactly as long as the case does
+    pool = lock(REF_LOCK) do
+        models = get!(() -> Dict{String,Vector{InnerModel}}(), ref, :inner_models)
+        get!(() -> InnerModel[], models, solver)
+    end
+
+    im = lock(() -> isempty(pool) ? nothing : pop!(pool), REF_LOCK)
+    (im === nothing) && (im = build_inner_model(ref, data["total_load"], solver))
+    try
+        return f(im)
+    finally
+        lock(() -> push!(pool, im), REF_LOCK)
+    end
+end
+
+"""
+Keep the pooled models of the case after its loads changed in place (see
+set_load_scenario!); the loads themselves are updated by the next solve
+"""
+function refresh_inner_models!(data, ref)
+    lock(REF_LOCK) do
+        for models in values(get(ref, :inner_models, Dict()))
+            for im in models
+                im.total_load = data["total_load"]
+            end
+        end
+    end
+end
+
+""" (lower, upper) limits of a generator ramped from its setpoint """
+function inner_gen_limits(gen::Dict, setpoint; percent_change=0.1)
+    (setpoint === nothing) && return (0.0, 0.0)
+    return (max(gen["pmin"], setpoint - percent_change * gen["pmax"]),
+            min(gen["pmax"], setpoint + percent_change * gen["pmax"]))
+end
+
+"""
+apply an interdicted case (status, setpoints and load caps) to the model;
+components that status marks inactive are left out of the model
+"""
+function update_inner_model!(im::InnerModel, case::InterdictedCase;
+    percent_change=0.1, status=propagate_topology_status(case, im.ref))
+    model, ref = im.model, im.ref
+
+    im.status = status
+
+    for l in keys(ref[:branch])
+        (im.branch_status[l] == im.status.branch[l]) && continue
+        _set_branch_status!(im, l, im.status.branch[l])
+    end
+
+    setpoints = case.setpoints
+    for (i, gen) in ref[:gen]
+        limits = !im.status.gen[i] ? (0.0, 0.0) :
+            inner_gen_limits(gen, get(setpoints, i, nothing);
+                percent_change=percent_change)
+        (im.gen_limits[i] == limits) && continue
+        z_gen = model[:z_gen][i]
+        JuMP.set_normalized_coefficient(im.gen_lb[i], z_gen, -limits[1])
+        JuMP.set_normalized_coefficient(im.gen_ub[i], z_gen, -limits[2])
+        im.gen_limits[i] = limits
+    end
+
+    # Cap the loads (i.e., lost load cannot be recovered); see modify_loads!
+    for (i, load) in ref[:load]
+        pd = im.status.load[i] ? load_pd(case, i) : 0.0
+        (im.load_pd[i] == pd) && continue
+        z_demand = model[:z_demand][i]
+        JuMP.set_objective_coefficient(model, z_demand, abs(pd))
+        JuMP.set_normalized_coefficient(im.balance[load["load_bus"]], z_demand, pd)
+        im.load_pd[i] = pd
+    end
+
+    for i in keys(ref[:shunt])
+        z_shunt = model[:z_shunt][i]
+        ub = im.status.shunt[i] ? 1.0 : 0.0
+        (JuMP.upper_bound(z_shunt) != ub) && JuMP.set_upper_bound(z_shunt, ub)
+    end
+end
+
+"""
+solve the persistent model; results are keyed as in the PowerModels path.
+The islands of the case are independent: islands with a closed form (see
+dc-ls-islands.jl) and islands solved before are not solved again, and the
+model only solves the others (not at all if no island is left)
+"""
+function solve_inner_model!(im::InnerModel, case::InterdictedCase;
+    percent_change=0.1)::NamedTuple
+    model, ref = im.model, im.ref
+
+    status = propagate_topology_status(case, ref)
+    limits = Dict(i => inner_gen_limits(gen, get(case.setpoints, i, nothing);
+                      percent_change=percent_change)
+                  for (i, gen) in ref[:gen] if status.gen[i])
+    pd = Dict(i => load_pd(case, i) for i in keys(ref[:load]) if status.load[i])
+    closed = solve_islands_closed_form!(status, ref, limits, pd)
+
+    served = Dict(string(i) => v for (i, v) in closed.loads)
+    pg = copy(closed.pg)
+    p = Dict{Int,Float64}()
+    function add_island_solution!(solution)
+        merge!(served, Dict(string(i) => v for (i, v) in solution.loads))
+        merge!(pg, solution.pg)
+        merge!(p, solution.p)
+    end
+
+    # Reuse the islands that an earlier solve left as they are
+    pending = []
+    for island in get_islands(ref, status)
+        key = island_cache_key(ref, island, limits, pd)
+        solution = get(ISLAND_CACHE, key, nothing)
+        if solution === nothing
+            push!(pending, (island, key))
+        else
+            add_island_solution!(solution)
+            set_island_status!(status, island, false)
+        end
+    end
+
+    if !isempty(pending)
+        update_inner_model!(im, case; percent_change=percent_change, status=status)
+        JuMP.optimize!(model)
+
+        # The islands do not interact, so each one's part is its own solution
+        for (island, key) in pending
+            solution = (
+                loads=Dict(i => im.load_pd[i] * JuMP.value(model[:z_demand][i])
+                           for i in island.loads),
+                pg=Dict(i => JuMP.value(model[:pg][i]) for i in island.gens),
+                p=Dict(l => abs(JuMP.value(model[:p][l])) for l in island.branches))
+            ISLAND_CACHE[key] = solution
+            add_island_solution!(solution)
+        end
+    end
+
+    load_shed = im.total_load - sum(values(served); init=0.0)
+
+    return (load_shed=load_shed, loads=served, pg=pg, p=p)
+end
+
+""" turn a branch on/off by changing its flow bounds and relaxing Ohm's law """
+function _set_branch_status!(im::InnerModel, l::Int, on::Bool)
+    branch = im.ref[:branch][l]
+    va = im.model[:va]
+    va_fr, va_to = va[branch["f_bus"]], va[branch["t_bus"]]
+
+    JuMP.set_normalized_coefficient(im.ohms[l], va_fr, on ? -1.0 : 0.0)
+    JuMP.set_normalized_coefficient(im.ohms[l], va_to, on ? 1.0 : 0.0)
+    JuMP.set_normalized_rhs(im.ohms[l], on ? -branch["shift"] : 0.0)
+
+    for (con, rhs) in ((im.angmax[l], branch["angmax"]),
+                       (im.angmin[l], branch["angmin"]))
+        JuMP.set_normalized_coefficient(con, va_fr, on ? 1.0 : 0.0)
+        JuMP.set_normalized_coefficient(con, va_to, on ? -1.0 : 0.0)
+        JuMP.set_normalized_rhs(con, on ? rhs : 0.0)
+    end
+
+    _set_branch_flow_bounds!(im.model[:p][l], branch, on)
+    im.branch_status[l] = on
+end
+
+function _set_branch_flow_bounds!(p, branch, on::Bool)
+    if !on
+        JuMP.set_lower_bound(p, 0.0)
+        JuMP.set_upper_bound(p, 0.0)
+    elseif haskey(branch, "rate_a")
+        JuMP.set_lower_bound(p, -branch["rate_a"])
+        JuMP.set_upper_bound(p, branch["rate_a"])
+    else
+        JuMP.has_lower_bound(p) && JuMP.delete_lower_bound(p)
+        JuMP.has_upper_bound(p) && JuMP.delete_upper_bound(p)
+    end
+end
@@ -1,16 +1,40 @@
 """ Get load shed and power flow solution on interdictable components"""
 function get_traditional_inner_solution(data, ref,
     generators::Vector, lines::Vector, setpoints::Dict;
-    percent_change=0.1, solver="cplex")::NamedTuple
+    percent_change=0.1, solver="cplex", persistent=true, cache=true)::NamedTuple
 
-    # Turn off lines/generators and propagate topology
-    case = interdict_components(data, generators, lines; make_deepcopy=true)
+    # Return the memoized solution if this state was solved before
+    if cache
+        key = inner_cache_key(:traditional, data, ref, generators, lines,
+            setpoints, nothing, percent_change, solver, persistent)
+        return get!(INNER_CACHE, key) do
+            get_traditional_inner_solution(data, ref, generators, lines, setpoints;
+                percent_change=percent_change, solver=solver,
+                persistent=persistent, cache=false)
+        end
+    end
 
-    lp_optimizer = get_lp_optimizer(solver)
+    # Turn off lines/generators; the overlay avoids deepcopying the case
+    case = interdict_components(data, generators, lines)
+    modify_setpoints!(case, setpoints)
 
-    pm = instantiate_model(case, DCPPowerModel,
+    # Re-parameterize the case's persistent model instead of rebuilding it
+    if persistent
+        cut_info = with_inner_model(data, ref, solver) do im
+            solve_inner_model!(im, case; percent_change=percent_change)
+        end
+        return (
+            load_shed=cut_info.load_shed,
+            all_loads=cut_info.loads,
+            pg=cut_info.pg,
+            p=cut_info.p)
+    end
+
+    pm = instantiate_model(materialize(case), DCPPowerModel,
         (pm) -> my_build_mld(pm, setpoints; percent_change=percent_change))
-    result = optimize_model!(pm, optimizer=lp_optimizer)
+    result = with_lp_optimizer(solver) do lp_optimizer
+        optimize_model!(pm, optimizer=lp_optimizer)
+    end
 
     pd = Dict(i => load["pd"] for (i, load) in result["solution"]["load"])
     load_shed = data["total_load"] - sum(values(pd))
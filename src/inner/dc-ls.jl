@@ -28,13 +28,9 @@ function get_inner_solution(data, ref,
     end
     PowerModels.propagate_topology_status!(case)
 
-    lp_optimizer = if solver == "cplex"
-        JuMP.optimizer_with_attributes(() -> CPLEX.Optimizer(), "CPX_PARAM_SCRIND" => 0)
-    else
-        JuMP.optimizer_with_attributes(() -> Gurobi.Optimizer(GRB_ENV), "LogToConsole" => 0)
+    return with_lp_optimizer(solver) do lp_optimizer
+        run_dc_ls(case, ref, scenario_generators, scenario_lines, lp_optimizer)
     end
-
-    return run_dc_ls(case, ref, scenario_generators, scenario_lines, lp_optimizer)
 end
 
 """ Get load shed and power flow solution on interdictable components"""
@@ -53,14 +49,10 @@ function get_inner_solution(data, ref, generators::Vector, lines::Vector;
     PowerModels.propagate_topology_status!(case)
 
     if use_pm
-        lp_optimizer = if solver == "cplex"
-            JuMP.optimizer_with_attributes(() -> CPLEX.Optimizer(), "CPX_PARAM_SCRIND" => 0)
-        else
-            JuMP.optimizer_with_attributes(() -> Gurobi.Optimizer(GRB_ENV), "LogToConsole" => 0)
-        end
-
         pm = instantiate_model(case, DCPPowerModel, deterministic_build_mld)
-        result = optimize_model!(pm, optimizer=lp_optimizer)
+        result = with_lp_optimizer(solver) do lp_optimizer
+            optimize_model!(pm, optimizer=lp_optimizer)
+        end
 
         load_served = [load["pd"] for (_, load) in result["solution"]["load"]] |> sum
         load_shed = case_data["total_load"] - load_served
@@ -148,13 +140,26 @@ end
 
 
 function run_dc_ls(case::Dict, original_ref::Dict; add_dc_lines_model::Bool=false)::NamedTuple
+    return with_lp_optimizer("gurobi") do lp_optimizer
+        run_dc_ls(case, original_ref, lp_optimizer;
+            add_dc_lines_model=add_dc_lines_model)
+    end
+end
+
+function run_dc_ls(case::Dict, original_ref::Dict, optimizer;
+    add_dc_lines_model::Bool=false)::NamedTuple
     PowerModels.standardize_cost_terms!(case, order=2)
     PowerModels.calc_thermal_limits!(case)
     ref = PowerModels.build_ref(case)[:it][:pm][:nw][0]
-    lp_optimizer = JuMP.optimizer_with_attributes(
-        () -> Gurobi.Optimizer(GRB_ENV), "LogToConsole" => 0
-    )
-    model = Model(lp_optimizer)
+
+    # Solve the islands with a closed form; the model only has the others
+    closed = if add_dc_lines_model
+        (loads=Dict{Int,Float64}(), pg=Dict{Int,Float64}())
+    else
+        remove_closed_form_islands!(ref)
+    end
+
+    model = Model(optimizer)
 
     @variable(model, va[i in keys(ref[:bus])])
     @variable(model,
@@ -202,7 +207,7 @@ function run_dc_ls(case::Dict, original_ref::Dict; add_dc_lines_model::Bool=fals
     end
 
     @objective(model, Min,
-        sum((1 - xd[i]) * load["pd"] for (i, load) in ref[:load]) +
+        sum((1 - xd[i]) * load["pd"] for (i, load) in ref[:load]; init=0.0) +
         sum((1 - xs[i]) * shunt["gs"] for (i, shunt) in ref[:shunt]; init=0.0)
     )
 
@@ -247,7 +252,7 @@ function run_dc_ls(case::Dict, original_ref::Dict; add_dc_lines_model::Bool=fals
         @constraint(model, va_fr - va_to <= branch["angmax"], base_name = "c_l_phase_diff_max_constr($i)")
         @constraint(model, va_fr - va_to >= branch["angmin"], base_name = "c_l_phase_diff_min_constr($i)")
     end
-    optimize!(model)
+    isempty(ref[:bus]) || optimize!(model)
 
     # get the load shed for each individual load based on the solution
     existing_loads = ref[:load] |> keys
@@ -263,6 +268,10 @@ function run_dc_ls(case::Dict, original_ref::Dict; add_dc_lines_model::Bool=fals
     isolated_load_shed = 0.0
     isolated_shunt_shed = 0.0
     for i in all_loads
+        if haskey(closed.loads, i)
+            load_shed[i] = loads[i]["pd"] - closed.loads[i]
+            continue
+        end
         if !(i in existing_loads)
             isolated_load_shed += loads[i]["pd"]
             continue
@@ -278,12 +287,40 @@ function run_dc_ls(case::Dict, original_ref::Dict; add_dc_lines_model::Bool=fals
     end
     total_pd = isolated_load_shed + sum(values(load_shed); init=0.0)
     total_gs = isolated_shunt_shed + sum(values(shunt_shed); init=0.0)
-    pg_values = Dict(i => JuMP.value(pg[i]) for i in keys(ref[:gen]))
+    pg_values = merge(closed.pg,
+        Dict(i => JuMP.value(pg[i]) for i in keys(ref[:gen])))
     p_values = Dict(l => abs(JuMP.value(p[(l, i, j)])) for (l, i, j) in ref[:arcs_from])
 
     return (load_shed=total_pd + total_gs, pg=pg_values, p=p_values)
 end
 
+"""
+Solve the islands of a (propagated) ref that have a closed form, with the
+generators free within their limits, and remove their components from ref.
+Returns the served loads and dispatch of those islands
+"""
+function remove_closed_form_islands!(ref::Dict)
+    status = TopologyStatus(
+        Dict(i => true for i in keys(ref[:bus])),
+        Dict(l => true for l in keys(ref[:branch])),
+        Dict(i => true for i in keys(ref[:gen])),
+        Dict(i => true for i in keys(ref[:load])),
+        Dict(i => true for i in keys(ref[:shunt])))
+    limits = Dict(i => (gen["pmin"], gen["pmax"]) for (i, gen) in ref[:gen])
+    pd = Dict(i => load["pd"] for (i, load) in ref[:load])
+    closed = solve_islands_closed_form!(status, ref, limits, pd)
+
+    for (component, active) in ((:bus, status.bus), (:gen, status.gen),
+                                (:load, status.load))
+        for (i, on) in active
+            on || delete!(ref[component], i)
+        end
+    end
+    filter!(x -> haskey(ref[:bus], first(x)), ref[:ref_buses])
+
+    return closed
+end
+
 function run_dc_ls(case::Dict, original_ref::Dict,
     scenario_generators::Dict{Int,Float64}, scenario_lines::Dict{Int,Float64},
     optimizer; add_dc_lines_model::Bool=false)::NamedTuple
@@ -0,0 +1,174 @@
+# dc-sensitivity.jl
+#
+# DC power flow sensitivities of a case. The reduced B matrix of the intact
+# network is factorized once (sparse LU); the flows after a set of k line
+# outages follow from one solve with the injections of a state and a k x k
+# (Woodbury) update, without solving the load shed model.
+
+""" data class that holds the factorized B matrix of the intact network """
+struct DCSensitivities
+    bus_index::Dict{Int,Int}
+    branch_index::Dict{Int,Int}
+    branches::Vector{Int}
+    rest::Vector{Int} # buses other than the reference bus
+    A::SparseMatrixCSC{Float64,Int} # branch x bus incidence (from = 1, to = -1)
+    b::Vector{Float64} # branch susceptances
+    factor::Factorization{Float64} # LU of B[rest, rest]
+    columns::Dict{Int,Vector{Float64}} # B[rest, rest] \ A[l, rest]', by branch
+    lock::ReentrantLock # guards the factorization and columns
+end
+
+""" factorize the reduced B matrix of the case """
+function build_dc_sensitivities(ref::Dict)
+    buses = sort(collect(keys(ref[:bus])))
+    branches = sort(collect(keys(ref[:branch])))
+    bus_index = Dict(i => j for (j, i) in enumerate(buses))
+    branch_index = Dict(l => j for (j, l) in enumerate(branches))
+
+    # Incidence and susceptance (matches dc-ls-persistent)
+    rows, cols, vals = Int[], Int[], Float64[]
+    b = zeros(length(branches))
+    for (j, l) in enumerate(branches)
+        branch = ref[:branch][l]
+        append!(rows, [j, j])
+        append!(cols, [bus_index[branch["f_bus"]], bus_index[branch["t_bus"]]])
+        append!(vals, [1.0, -1.0])
+        b[j] = 1.0 / (branch["br_x"] * branch["tap"])
+    end
+    A = sparse(rows, cols, vals, length(branches), length(buses))
+
+    slack = bus_index[first(sort(collect(keys(ref[:ref_buses]))))]
+    rest = [j for j in eachindex(buses) if j != slack]
+
+    B = A' * Diagonal(b) * A
+    factor = lu(B[rest, rest])
+
+    return DCSensitivities(bus_index, branch_index, branches, rest, A, b,
+        factor, Dict(), ReentrantLock())
+end
+
+""" B[rest, rest] \\ A[j, rest]' for the branch in position j, solved once """
+function outage_column(sens::DCSensitivities, j::Int)
+    return lock(sens.lock) do
+        get!(() -> sens.factor \ Vector(sens.A[j, sens.rest]), sens.columns, j)
+    end
+end
+
+"""
+Flows after the outage of the branches in positions K, with net injections
+`injection`. The outages are a rank-k update of B, so by the Woodbury identity
+
+    theta' = theta + W (D^-1 - U' W)^-1 U' theta, U = A[K, rest]', W = B^-1 U
+
+with D the susceptances of K. Return nothing if the outages island a bus,
+i.e., if the k x k matrix is singular
+"""
+function post_outage_flows(sens::DCSensitivities, injection::Vector{Float64}, K;
+    tol=1e-6)
+    theta = zeros(size(sens.A, 2))
+    # The factorization is shared by the threads of a case
+    theta[sens.rest] = lock(() -> sens.factor \ injection[sens.rest], sens.lock)
+    if !isempty(K)
+        U = Matrix(sens.A[K, sens.rest]')
+        W = reduce(hcat, [outage_column(sens, j) for j in K])
+        M = I - Diagonal(sens.b[K]) * (U' * W)
+        (abs(det(M)) < tol) && return nothing # islanding
+        theta[sens.rest] += W * (M \ (Diagonal(sens.b[K]) * (U' * theta[sens.rest])))
+    end
+
+    flows = sens.b .* (sens.A * theta)
+    flows[K] .= 0.0
+    return flows
+end
+
+"""
+Return the sensitivities of the case, computing them once. nothing if they do
+not apply (dc lines, phase shifters or an intact network with several islands)
+"""
+function get_dc_sensitivities(ref::Dict)
+    return lock(REF_LOCK) do
+        get!(ref, :dc_sensitivities) do
+            !isempty(get(ref, :dcline, Dict())) && return nothing
+            any(br["shift"] != 0.0 for br in values(ref[:branch])) && return nothing
+            (length(ref[:ref_buses]) != 1) && return nothing
+            try
+                return build_dc_sensitivities(ref)
+            catch e
+                (e isa LinearAlgebra.SingularException) || rethrow()
+                return nothing
+            end
+        end
+    end
+end
+
+"""
+Flows (|p|, keyed by branch) after the outage of `lines`, with the generators at
+`setpoints` and the loads at `loads`. Return nothing if the flows cannot be
+trusted, so the caller solves the load shed model instead, i.e., if the
+injections do not balance, a generator is off its ramping range, the outages
+island a bus, or a thermal or angle difference limit is violated. Otherwise,
+these are the flows of the optimal solution that keeps all generators at their
+setpoints and serves all loads.
+"""
+function get_sensitivity_flows(ref::Dict, lines, setpoints::Dict, loads::Dict;
+    percent_change=0.1, tol=1e-6)
+    sens = get_dc_sensitivities(ref)
+    (sens === nothing) && return nothing
+
+    # Net injections of the state
+    injection = zeros(length(sens.bus_index))
+    for (i, gen) in ref[:gen]
+        pg = get(setpoints, i, 0.0)
+        lo = max(gen["pmin"], pg - percent_change * gen["pmax"])
+        hi = min(gen["pmax"], pg + percent_change * gen["pmax"])
+        (pg != 0.0 && !(lo - tol <= pg <= hi + tol)) && return nothing
+        injection[sens.bus_index[gen["gen_bus"]]] += pg
+    end
+    for (i, pd) in loads
+        load = ref[:load][to_index(i)]
+        injection[sens.bus_index[load["load_bus"]]] -= pd
+    end
+    for (_, shunt) in ref[:shunt]
+        injection[sens.bus_index[shunt["shunt_bus"]]] -= shunt["gs"]
+    end
+    (abs(sum(injection)) > tol) && return nothing
+
+    # Flows after the outages
+    K = unique([sens.branch_index[to_index(l)] for l in lines])
+    flows = post_outage_flows(sens, injection, K; tol=tol)
+    (flows === nothing) && return nothing
+
+    # The load shed model would have to re-dispatch if any limit binds
+    p = Dict{Int,Float64}()
+    for (j, l) in enumerate(sens.branches)
+        in(j, K) && continue
+        branch = ref[:branch][l]
+        (haskey(branch, "rate_a") && abs(flows[j]) > branch["rate_a"] + tol) &&
+            return nothing
+        angle = branch["br_x"] * branch["tap"] * flows[j]
+        !(branch["angmin"] - tol <= angle <= branch["angmax"] + tol) &&
+            return nothing
+        p[l] = abs(flows[j])
+    end
+
+    return p
+end
+
+"""
+inner solution (as get_permutation_inner_solution) of cutting it_data.lines
+when their flows stay within limits: the setpoints and served loads of the
+state do not change. nothing if the load shed model has to be solved
+"""
+function get_sensitivity_inner_solution(data, ref, it_data::IterData;
+    percent_change=0.1)
+    p = get_sensitivity_flows(ref, it_data.lines,
+        it_data.prev_gen_setpoints, it_data.prev_loads;
+        percent_change=percent_change)
+    (p === nothing) && return nothing
+
+    loads = Dict(string(to_index(i)) => pd for (i, pd) in it_data.prev_loads)
+    pg = Dict(i => get(it_data.prev_gen_setpoints, i, 0.0) for i in keys(ref[:gen]))
+    load_shed = data["total_load"] - sum(values(loads); init=0.0)
+
+    return (load_shed=load_shed, loads=loads, pg=pg, p=p)
+end
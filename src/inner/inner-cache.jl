@@ -0,0 +1,44 @@
+# inner-cache.jl
+#
+# Memoizes inner solutions across heuristics; the same interdiction state
+# (case, lines, generators, setpoints, loads, ramping bound) is solved once.
+
+const INNER_CACHE = LRUCache{Any,NamedTuple}(1024)
+
+# Solutions of single islands of the persistent model (see solve_inner_model!)
+const ISLAND_CACHE = LRUCache{Any,NamedTuple}(1024)
+
+const CASE_COUNTER = Threads.Atomic{Int}(0)
+
+""" unique id of a case (ref); unlike objectid, it is never reused """
+case_id(ref::Dict) = lock(REF_LOCK) do
+    get!(() -> Threads.atomic_add!(CASE_COUNTER, 1) + 1, ref, :case_id)
+end
+
+""" set the number of inner (and island) solutions kept in the caches (0 disables them) """
+function set_inner_cache_capacity!(capacity::Int)
+    for cache in (INNER_CACHE, ISLAND_CACHE)
+        cache.capacity = capacity
+        (capacity < length(cache)) && empty!(cache)
+    end
+end
+
+""" key of an inner solve; line/generator order does not change the solution """
+function inner_cache_key(kind::Symbol, data, ref, generators, lines,
+    setpoints, loads, percent_change, solver, persistent)
+    return (kind, case_id(ref), data["total_load"],
+        sort!([to_index(i) for i in lines]),
+        sort!([to_index(i) for i in generators]),
+        setpoints, loads, percent_change, solver, persistent)
+end
+
+"""
+key of the solve of one island; the island is independent of the rest of the
+network, so it only depends on its components, generator limits and loads
+"""
+function island_cache_key(ref, island::Island, limits::Dict, pd::Dict)
+    return (case_id(ref), sort(island.buses), sort(island.branches),
+        sort!([(g, limits[g]) for g in island.gens]),
+        sort!([(d, pd[d]) for d in island.loads]),
+        sort(island.shunts))
+end
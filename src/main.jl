@@ -5,6 +5,11 @@ using JuMP
 using Gurobi
 using PrettyTables
 using Logging
+using Random
+using LinearAlgebra
+using SparseArrays
+using SHA
+using Serialization
 
 using Combinatorics
 
@@ -14,7 +19,10 @@ include("utils/types.jl")
 include("utils/utils.jl")
 include("utils/ioutils.jl")
 include("utils/datautils.jl")
+include("utils/topology.jl")
 include("utils/optimizationutils.jl")
+include("utils/cutpool.jl")
+include("utils/scenarios.jl")
 
 include("outer/traditional.jl")
 include("outer/permutation.jl")
@@ -23,11 +31,18 @@ include("outer/enumeration.jl")
 include("outer/greedy-criticality.jl")
 include("outer/greedy-flow.jl")
 include("outer/greedy-impact.jl")
+include("outer/greedy-lazy.jl")
 include("outer/ours.jl")
+include("outer/ours-beam.jl")
+include("outer/time-expanded.jl")
 
 include("inner/pm_model.jl")
+include("inner/dc-ls-persistent.jl")
+include("inner/dc-ls-islands.jl")
 include("inner/dc-ls-traditional.jl")
 include("inner/dc-ls-permutation.jl")
+include("inner/inner-cache.jl")
+include("inner/dc-sensitivity.jl")
 
 # "Deterministic" version; for testing
 include("outer/run.jl")
@@ -42,8 +57,6 @@ include("network_properties/network-properties.jl")
 # include("experiments/experiment2.jl")
 # include("experiments/experiment3.jl")
 
-const GRB_ENV = Gurobi.Env()
-
 PowerModels.silence()
 
 # ConsoleLogger to stderr that accepts messages with level >= Logging.Debug
@@ -64,8 +77,15 @@ function main()
         show_header=false)
 
     validate_parameters(cliargs)
+    isnothing(cliargs["seed"]) || Random.seed!(cliargs["seed"])
+    set_inner_cache_capacity!(cliargs["inner_cache_size"])
+    set_cut_pool_capacity!(cliargs["cut_pool_size"])
     files = get_filenames_with_paths(cliargs)
     run(cliargs, files)
+    DEBUG && println("Inner solution cache: ", INNER_CACHE)
+    DEBUG && println("Island solution cache: ", ISLAND_CACHE)
+    DEBUG && println("Cut pool: ", CUT_POOL.cuts)
+    DEBUG && println("Gurobi environments: ", GRB_ENV_POOL)
     return
 end
 
@@ -97,6 +117,11 @@ function run(cliargs, files)
         return
     end
 
+    if cliargs["problem"] == "enumeration" && cliargs["shard"] > 0
+        run_enumeration_shard(cliargs, mp_file)
+        return
+    end
+
     if cliargs["problem"] == "enumeration"
         results = run_enumeration(cliargs, mp_file)
         write_results(cliargs, results)
@@ -104,6 +129,13 @@ function run(cliargs, files)
         return
     end
 
+    if cliargs["problem"] == "time_expanded"
+        results = run_time_expanded(cliargs, mp_file)
+        write_results(cliargs, results)
+        println(results)
+        return
+    end
+
     # "Baseline" approaches
     if cliargs["problem"] == "criticality"
         results = run_greedy_criticality(cliargs, mp_file)
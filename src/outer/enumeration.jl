@@ -4,6 +4,9 @@
 
 """ run algorithm for enumeration N-k """
 function run_enumeration(cliargs::Dict, mp_file::String)::PermutationResults
+    # Shard the orders across worker processes
+    (cliargs["workers"] > 1) && return run_sharded_enumeration(cliargs, mp_file)
+
     data, ref = init_models_data_ref(
         mp_file; 
         do_perturb_loads=cliargs["do_perturb_loads"])
@@ -17,43 +20,170 @@ function solve_enumeration(cliargs::Dict, data::Dict, ref::Dict)
     loads = Dict(i => load["pd"] for (i, load) in ref[:load])
     pf = Dict(i => br["pf"] for (i, br) in ref[:branch])
 
-    solutions = Dict()
+    # Every order of every combination of `budget` lines; orders that share a
+    # prefix (even across combinations) share the solves of that prefix
+    it_data = IterData(loads, setpoints, pf)
+    solutions = solve_orders(cliargs, data, ref, sort(collect(keys(ref[:branch]))),
+        cliargs["budget"], it_data; on_error=log_enumeration_error)
 
-    for lines in combinations(collect(keys(ref[:branch])), cliargs["budget"])
+    return pack_enumeration_solution(solutions)
+end
 
-        DEBUG && println("Set of lines = $(lines)")
+""" some ordering that caused an error; the step is skipped """
+log_enumeration_error(e) = @warn "error occurred while solving an order" exception=e
 
-        for porder in permutations(lines)
-            permutation = []
-            it_data = IterData(loads, setpoints, pf)
+################################################################################
+# Sharded enumeration
+#
+# The orders are split into tasks by the set of lines failed in the first step.
+# The coordinator saves its cliargs to cliargs.jls, so that the shards run with
+# the same settings, and relaunches main.jl once per shard; shard s solves the tasks
+# t with (t - 1) % workers == s - 1 and appends the rows of each task to
+# shard-<s>.csv, then the task id to shard-<s>.done. A re-run with the same
+# options skips the tasks that are marked done by any shard, so it resumes
+# after a crash.
+################################################################################
 
-            for iter_lines in take_n_items(porder, cliargs["iterline_budget"])
-                push!(permutation, iter_lines)
-                it_data.lines = collect(Iterators.flatten(permutation))
+""" run enumeration N-k with cliargs["workers"] processes, then merge shards """
+function run_sharded_enumeration(cliargs::Dict, mp_file::String;
+    max_attempts=3)::PermutationResults
+    # All shards must perturb the loads identically
+    seed = something(cliargs["seed"], 0)
+    dir = get_enumeration_shard_dir(cliargs, seed)
+    mkpath(dir)
+    serialize("$(dir)cliargs.jls", cliargs)
 
-                DEBUG && println("Solving with lines=$(it_data.lines)")
-                try
-                    solve_partial_interdiction(cliargs, data, ref, it_data)
-                catch e
-                    # Some ordering that caused an error
-                    println("Error occurred", e)
-                    println("Press enter to continue...")
-                    readline()
-                    continue
-                end
-            end
+    pending = collect(1:cliargs["workers"])
+    for attempt in 1:max_attempts
+        isempty(pending) && break
+        procs = Dict(s => Base.run(pipeline(get_shard_cmd(cliargs, s, seed);
+                                       stdout="$(dir)shard-$(s).log",
+                                       stderr="$(dir)shard-$(s).log",
+                                       append=true); wait=false)
+                     for s in pending)
+        foreach(wait, values(procs))
+        pending = sort!([s for (s, p) in procs if !success(p)])
+        isempty(pending) ||
+            @warn "shards $(pending) failed (attempt $(attempt)); see $(dir)"
+    end
+    isempty(pending) ||
+        error("shards $(pending) did not finish; re-run to resume from $(dir)")
+
+    return pack_enumeration_solution(read_enumeration_shards(dir))
+end
+
+""" solve the tasks of one shard (cliargs["shard"]) of the enumeration """
+function run_enumeration_shard(cliargs::Dict, mp_file::String)
+    # Run with the settings of the coordinator
+    if cliargs["shard_cliargs"] !== nothing
+        cliargs = merge(deserialize(cliargs["shard_cliargs"]),
+            Dict("shard" => cliargs["shard"], "seed" => cliargs["seed"]))
+        set_inner_cache_capacity!(cliargs["inner_cache_size"])
+        set_cut_pool_capacity!(cliargs["cut_pool_size"])
+    end
+
+    Random.seed!(something(cliargs["seed"], 0))
+    data, ref = init_models_data_ref(
+        mp_file;
+        do_perturb_loads=cliargs["do_perturb_loads"])
+
+    shard, workers = cliargs["shard"], cliargs["workers"]
+    dir = get_enumeration_shard_dir(cliargs, something(cliargs["seed"], 0))
+    done = read_enumeration_done(dir)
+
+    setpoints = Dict(i => gen["pg"] for (i, gen) in ref[:gen])
+    loads = Dict(i => load["pd"] for (i, load) in ref[:load])
+    pf = Dict(i => br["pf"] for (i, br) in ref[:branch])
+    it_data = with_topology(IterData(loads, setpoints, pf), ref)
+
+    branches = sort(collect(keys(ref[:branch])))
+    k = cliargs["budget"]
+    m = min(cliargs["iterline_budget"], k, length(branches))
 
-            # Save solution at the end of all rounds for porder
-            solutions[permutation] = Solution(
-                permutation,
-                [],
-                it_data.solution.load_shed,
-                it_data.solution.stats
-            )
+    for (t, step) in enumerate(combinations(branches, m))
+        ((t - 1) % workers != shard - 1 || t in done) && continue
+
+        solutions = Dict()
+        _solve_step!(solutions, cliargs, data, ref, branches, k, [],
+            it_data, step, log_enumeration_error)
+
+        open("$(dir)shard-$(shard).csv", "a") do f
+            for (perm, soln) in solutions
+                pstr = join((join(x, ";") for x in perm), "/")
+                write(f, "$(t),$(soln.load_shed),$(pstr)\n")
+            end
         end
+        open(f -> write(f, "$(t)\n"), "$(dir)shard-$(shard).done", "a")
     end
+end
 
-    return pack_enumeration_solution(solutions)
+"""
+directory with the shard files of an enumeration run; it includes a hash of
+the cliargs, so that a run with other options does not resume from its files
+"""
+function get_enumeration_shard_dir(cliargs::Dict, seed)
+    case = first(split(cliargs["case"], "."))
+    k, m = cliargs["budget"], cliargs["iterline_budget"]
+    pc = cliargs["generator_ramping_bounds"]
+    h = enumeration_cliargs_hash(cliargs)
+    return cliargs["output_path"] *
+           "cache/enumeration/$(case)_k$(k)_m$(m)_pc$(pc)_seed$(seed)_$(h)/"
+end
+
+""" hash of the cliargs that a shard depends on (not the shard assignment) """
+function enumeration_cliargs_hash(cliargs::Dict)
+    ignored = ("shard", "shard_cliargs", "workers", "seed")
+    args = sort!([(key, value) for (key, value) in cliargs if !in(key, ignored)];
+        by=first)
+    return bytes2hex(sha1(repr(args)))[1:12]
+end
+
+"""
+command that relaunches main.jl as shard `shard` of the enumeration; the shard
+reads the other cliargs from the cliargs.jls of the coordinator
+"""
+function get_shard_cmd(cliargs::Dict, shard::Int, seed)
+    dir = get_enumeration_shard_dir(cliargs, seed)
+    args = ["--problem", "enumeration",
+        "--workers", string(cliargs["workers"]),
+        "--shard", string(shard),
+        "--seed", string(seed),
+        "--shard_cliargs", "$(dir)cliargs.jls"]
+    # Needed by main.jl before the cliargs are read
+    for key in ["case", "data_path", "filetype", "output_path", "budget",
+        "line_budget", "generator_budget", "iterline_budget"]
+        push!(args, "--$(key)", string(cliargs[key]))
+    end
+    cliargs["use_separate_budgets"] && push!(args, "--use_separate_budgets")
+
+    main_file = joinpath(@__DIR__, "..", "main.jl")
+    return `$(Base.julia_cmd()) --project=$(Base.active_project()) $(main_file) $(args)`
+end
+
+""" ids of the tasks that are finished in any shard """
+function read_enumeration_done(dir::String)
+    done = Set{Int}()
+    for file in readdir(dir; join=true)
+        endswith(file, ".done") || continue
+        union!(done, parse.(Int, filter(!isempty, readlines(file))))
+    end
+    return done
+end
+
+""" solutions of all finished tasks; rows of unfinished tasks are ignored """
+function read_enumeration_shards(dir::String)
+    done = read_enumeration_done(dir)
+    solutions = Dict()
+    for file in readdir(dir; join=true)
+        endswith(file, ".csv") || continue
+        for line in eachline(file)
+            t, ls, pstr = split(line, ","; limit=3)
+            (parse(Int, t) in done) || continue
+            perm = Any[parse.(Int, split(x, ";")) for x in split(pstr, "/")]
+            solutions[perm] = Solution(perm, [], parse(Float64, ls), Dict())
+        end
+    end
+    return solutions
 end
 
 function pack_enumeration_solution(solutions)
@@ -18,8 +18,25 @@ function solve_greedy_criticality(cliargs::Dict, data::Dict, ref::Dict)
     pf = Dict(i => br["pf"] for (i,br) in ref[:branch])
 
     init_it_data = IterData(loads, setpoints, pf)
-    p0 = get_top_criticality(data, ref, init_it_data, cliargs["inner_solver"];
+
+    # Lazy mode keeps the last score of each line and re-solves only the head;
+    # the line with the lowest criticality is cut, so the gain is its negation
+    lg = cliargs["lazy_greedy"] ? LazyGreedy(collect(keys(ref[:branch]))) : nothing
+    crit(it_data) = i -> begin
+        pc = cliargs["generator_ramping_bounds"]
+        cut_info = get_permutation_inner_solution(
+            data, ref, [], [it_data.lines..., i], it_data;
+            percent_change=pc, solver=cliargs["inner_solver"]
+        )
+        -criticality(ref, cut_info.p, cut_info.pg, pc)
+    end
+
+    p0 = if lg !== nothing
+        lazy_greedy_select!(lg, init_it_data, crit(init_it_data))
+    else
+        get_top_criticality(data, ref, init_it_data, cliargs["inner_solver"];
                 percent_change=cliargs["generator_ramping_bounds"])[1]
+    end
     
     solutions = Dict()
 
@@ -32,9 +49,13 @@ function solve_greedy_criticality(cliargs::Dict, data::Dict, ref::Dict)
     it_data = IterData([p0],loads, Dict(),setpoints, Dict(),pf,pf,Solution())
 
     for _ in 2:cliargs["line_budget"]
-        iter_lines = get_top_criticality(data, ref, it_data, 
-            cliargs["inner_solver"]; 
-            percent_change=cliargs["generator_ramping_bounds"])
+        iter_lines = if lg !== nothing
+            [lazy_greedy_select!(lg, it_data, crit(it_data))]
+        else
+            get_top_criticality(data, ref, it_data, 
+                cliargs["inner_solver"]; 
+                percent_change=cliargs["generator_ramping_bounds"])
+        end
         push!(permutation, iter_lines)
         it_data.lines = collect(Iterators.flatten(permutation))
 
@@ -47,7 +68,8 @@ function solve_greedy_criticality(cliargs::Dict, data::Dict, ref::Dict)
         permutation,
         [],
         it_data.solution.load_shed,
-        it_data.solution.stats
+        lg === nothing ? it_data.solution.stats :
+            lazy_greedy_stats(lg, it_data.solution.stats)
     )
 
     return pack_permutation_solution(solutions)
@@ -58,16 +80,19 @@ function get_top_criticality(data, ref, it_data, solver;
         n=1, percent_change=0.1)
     crits = Dict()
 
-    for (i,br) in ref[:branch]
-        in(i, it_data.lines) && continue
-
+    # Candidates are evaluated on threads; results are added in serial order
+    candidates = [i for i in keys(ref[:branch]) if !in(i, it_data.lines)]
+    crit_values = threaded_map(candidates) do i
         cut_info = get_permutation_inner_solution(
             data, ref, [], [it_data.lines..., i], it_data;
             percent_change=percent_change, solver=solver
         )
-
-        crits[i] = criticality(ref, cut_info.p, cut_info.pg, percent_change)
+        return criticality(ref, cut_info.p, cut_info.pg, percent_change)
+    end
+    for (i, crit) in zip(candidates, crit_values)
+        crits[i] = crit
     end
 
-    return map(first, sort(collect(crits), by=x -> x[2])[1:n])
+    # Ties go to the lowest line id
+    return map(first, sort(collect(crits), by=x -> (x[2], x[1]))[1:n])
 end
@@ -32,7 +32,8 @@ function solve_greedy_flow(cliargs::Dict, data::Dict, ref::Dict)
     for i in 1:cliargs["line_budget"]
         iter_lines = i == 1 ? [p0] : get_next_pf(data, ref, it_data, 
             cliargs["inner_solver"]; 
-            percent_change=cliargs["generator_ramping_bounds"])
+            percent_change=cliargs["generator_ramping_bounds"],
+            sensitivity=cliargs["prefilter"])
         push!(permutation, iter_lines)
         it_data.lines = collect(Iterators.flatten(permutation))
 
@@ -51,13 +52,26 @@ function solve_greedy_flow(cliargs::Dict, data::Dict, ref::Dict)
     return pack_permutation_solution(solutions)
 end
 
-""" return the next component to cut (the line with the most flow)"""
-function get_next_pf(data, ref, it_data, solver; percent_change=0.1)
-    cut_info = get_permutation_inner_solution(
-        data, ref, [], it_data.lines, it_data;
-        percent_change=percent_change, solver=solver
-    )
+"""
+return the next component to cut (the line with the most flow). With
+sensitivity, the flows hold the generators at their setpoints instead of the
+dispatch of the inner LP, so the line may differ from that of the LP
+"""
+function get_next_pf(data, ref, it_data, solver; 
+        percent_change=0.1, sensitivity=false)
+    # Flows from the PTDF/LODF of the case, unless a limit binds
+    p = sensitivity ? get_sensitivity_flows(ref, it_data.lines,
+        it_data.prev_gen_setpoints, it_data.prev_loads;
+        percent_change=percent_change) : nothing
+
+    if p === nothing
+        cut_info = get_permutation_inner_solution(
+            data, ref, [], it_data.lines, it_data;
+            percent_change=percent_change, solver=solver
+        )
+        p = cut_info.p
+    end
 
     # Return value of the max pair
-    return [maximum(x -> (x[2],x[1]), cut_info.p)[2]]
+    return [maximum(x -> (x[2],x[1]), p)[2]]
 end
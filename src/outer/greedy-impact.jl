@@ -16,8 +16,23 @@ function solve_greedy_impact(cliargs::Dict, data::Dict, ref::Dict)
     pf = Dict(i => br["pf"] for (i,br) in ref[:branch])
 
     init_it_data = IterData(loads, setpoints, pf)
-    p0 = get_top_impacts(data, ref, init_it_data, cliargs["inner_solver"];
+
+    # Lazy mode keeps the last impact of each line and re-solves only the head;
+    # the impact is the load shed added to that of it_data
+    lg = cliargs["lazy_greedy"] ? LazyGreedy(collect(keys(ref[:branch]))) : nothing
+    impact(it_data) = i -> get_permutation_inner_solution(
+            data, ref, [], [it_data.lines..., i], it_data;
+            percent_change=cliargs["generator_ramping_bounds"],
+            solver=cliargs["inner_solver"]
+        ).load_shed -
+        (data["total_load"] - sum(values(it_data.prev_loads); init=0.0))
+
+    p0 = if lg !== nothing
+        lazy_greedy_select!(lg, init_it_data, impact(init_it_data))
+    else
+        get_top_impacts(data, ref, init_it_data, cliargs["inner_solver"];
                 percent_change=cliargs["generator_ramping_bounds"])[1]
+    end
     
     solutions = Dict()
 
@@ -30,9 +45,15 @@ function solve_greedy_impact(cliargs::Dict, data::Dict, ref::Dict)
     it_data = IterData(loads, setpoints, pf)
 
     for i in 1:cliargs["line_budget"]
-        iter_lines = i == 1 ? [p0] : get_top_impacts(data, ref, it_data, 
-            cliargs["inner_solver"]; 
-            percent_change=cliargs["generator_ramping_bounds"])
+        iter_lines = if i == 1
+            [p0]
+        elseif lg !== nothing
+            [lazy_greedy_select!(lg, it_data, impact(it_data))]
+        else
+            get_top_impacts(data, ref, it_data, 
+                cliargs["inner_solver"]; 
+                percent_change=cliargs["generator_ramping_bounds"])
+        end
         push!(permutation, iter_lines)
         it_data.lines = collect(Iterators.flatten(permutation))
 
@@ -45,7 +66,8 @@ function solve_greedy_impact(cliargs::Dict, data::Dict, ref::Dict)
         permutation,
         [],
         it_data.solution.load_shed,
-        it_data.solution.stats
+        lg === nothing ? it_data.solution.stats :
+            lazy_greedy_stats(lg, it_data.solution.stats)
     )
 
     return pack_permutation_solution(solutions)
@@ -55,16 +77,19 @@ end
 function get_top_impacts(data, ref, it_data, solver; n=1, percent_change=0.1)
     impacts = Dict()
 
-    for (i,br) in ref[:branch]
-        in(i, it_data.lines) && continue
-
+    # Candidates are evaluated on threads; results are added in serial order
+    candidates = [i for i in keys(ref[:branch]) if !in(i, it_data.lines)]
+    load_sheds = threaded_map(candidates) do i
         cut_info = get_permutation_inner_solution(
             data, ref, [], [it_data.lines..., i], it_data;
             percent_change=percent_change, solver=solver
         )
-
-        impacts[i] = cut_info.load_shed
+        return cut_info.load_shed
+    end
+    for (i, load_shed) in zip(candidates, load_sheds)
+        impacts[i] = load_shed
     end
 
-    return map(first, sort(collect(impacts), by=x -> -x[2])[1:n])
+    # Ties go to the lowest line id
+    return map(first, sort(collect(impacts), by=x -> (-x[2], x[1]))[1:n])
 end
\ No newline at end of file
@@ -0,0 +1,78 @@
+# greedy-lazy.jl
+#
+# Lazy (CELF) version of the greedy selection used by greedy-impact and
+# greedy-criticality. Candidates are kept with the gain of their last
+# evaluation; only the head is re-evaluated until it stays on top.
+
+""" data class that holds the stale gains of the lazy greedy selection """
+mutable struct LazyGreedy
+    gains::Dict{Int,Float64}
+    fresh::Dict{Int,Int}   # step at which the gain was computed
+    step::Int
+    evaluations::Int
+    skipped::Int
+    violations::Int        # steps in which a re-evaluated gain increased
+end
+
+LazyGreedy(candidates) = LazyGreedy(
+    Dict(i => Inf for i in candidates),
+    Dict(i => 0 for i in candidates),
+    0, 0, 0, 0)
+
+# Gains that grow by less than this are taken as numerical noise of the LPs
+const LAZY_GREEDY_TOL = 1e-6
+
+"""
+Select the candidate with the highest gain(i) among those not in it_data.lines;
+ties go to the lowest line id, as in the exhaustive selection. gain(i) is the
+marginal gain of cutting i after it_data.lines. CELF needs gains that only
+decrease as lines are cut, so that stale gains are upper bounds and a head that
+stays on top after re-evaluation is the best candidate. If a re-evaluated
+gain increases, that does not hold, and all candidates are evaluated in this
+step; the next step is lazy again.
+"""
+function lazy_greedy_select!(lg::LazyGreedy, it_data::IterData, gain::Function)
+    lg.step += 1
+    for i in it_data.lines
+        delete!(lg.gains, i)
+    end
+
+    evaluations, exhaustive = 0, false
+    while true
+        # Highest gain; ties go to the lowest line id
+        head = argmax(i -> (lg.gains[i], -i), keys(lg.gains))
+        if lg.fresh[head] == lg.step
+            lg.evaluations += evaluations
+            lg.skipped += length(lg.gains) - evaluations
+            return head
+        end
+
+        stale = lg.gains[head]
+        lg.gains[head] = gain(head)
+        lg.fresh[head] = lg.step
+        evaluations += 1
+        if !exhaustive && lg.gains[head] > stale + LAZY_GREEDY_TOL
+            lg.violations += 1
+            exhaustive = true
+        end
+
+        if exhaustive
+            stale_candidates = [i for i in keys(lg.gains) if lg.fresh[i] != lg.step]
+            for (i, g) in zip(stale_candidates, threaded_map(gain, stale_candidates))
+                lg.gains[i] = g
+                lg.fresh[i] = lg.step
+            end
+            evaluations += length(stale_candidates)
+        end
+    end
+end
+
+""" add the evaluation counts of the lazy greedy selection to the stats """
+function lazy_greedy_stats(lg::LazyGreedy, stats::Dict)
+    DEBUG && println("Lazy greedy: $(lg.evaluations) evaluations, ",
+        "$(lg.skipped) skipped, $(lg.violations) steps with increased gains")
+    return merge(stats, Dict{Symbol,Any}(
+        :evaluations => lg.evaluations,
+        :skipped_evaluations => lg.skipped,
+        :increased_gains => lg.violations))
+end
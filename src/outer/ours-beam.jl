@@ -0,0 +1,103 @@
+# ours-beam.jl
+#
+# Beam search version of SEQUIN: instead of committing to the single line with
+# the most impact, keep the beam_width partial sequences with the most load
+# shed at each depth
+
+""" data class that holds a partial sequence of the beam """
+struct BeamNode
+    permutation::Vector
+    it_data::IterData
+end
+
+""" solve SEQUIN with a beam of cliargs["beam_width"] partial sequences """
+function solve_approach_beam(cliargs::Dict, data::Dict, ref::Dict)
+    # Cache the generator setpoints and loads at equilibrium
+    setpoints = Dict(i => gen["pg"] for (i, gen) in ref[:gen])
+    loads = Dict(i => load["pd"] for (i, load) in ref[:load])
+    pf = Dict(i => br["pf"] for (i,br) in ref[:branch])
+
+    init_it_data = IterData(loads, setpoints, pf)
+
+    # Roots are the top power flow lines, as in solve_approach
+    pfs = get_top_pfs(data, ref, init_it_data, cliargs["inner_solver"];
+            init=true,
+            n=min(cliargs["roots"], length(ref[:branch])),
+            percent_change=cliargs["generator_ramping_bounds"])
+
+    beam = [BeamNode([], init_it_data)]
+    expansions = [(node, [p0]) for node in beam for p0 in pfs]
+
+    for depth in 1:cliargs["line_budget"]
+        beam = expand_beam(cliargs, data, ref, expansions)
+
+        DEBUG && println("Beam at depth $(depth): ",
+            [(node.permutation, node.it_data.solution.load_shed) for node in beam])
+
+        (depth == cliargs["line_budget"]) && break
+        expansions = [(node, [i]) for node in beam
+                      for i in get_beam_candidates(cliargs, data, ref, node)]
+    end
+
+    solutions = Dict()
+    for node in beam
+        solutions[node.permutation] = Solution(
+            node.permutation,
+            [],
+            node.it_data.solution.load_shed,
+            node.it_data.solution.stats
+        )
+    end
+
+    return pack_permutation_solution(solutions)
+end
+
+"""
+Solve each (node, lines) expansion, drop the expansions that reach a state
+already in the beam, and keep the beam_width ones with the most load shed
+"""
+function expand_beam(cliargs::Dict, data::Dict, ref::Dict, expansions)
+    children = threaded_map(expansions) do (node, iter_lines)
+        it_data = copy(node.it_data)
+        it_data.lines = [node.it_data.lines..., iter_lines...]
+        solve_partial_interdiction(cliargs, data, ref, it_data)
+        return BeamNode(Any[node.permutation..., iter_lines], it_data)
+    end
+
+    # Same failed lines and same state (e.g., [a,b] and [b,a] with equal flows)
+    seen = Set()
+    unique_children = BeamNode[]
+    for child in children
+        key = beam_state_key(child.it_data)
+        (key in seen) && continue
+        push!(seen, key)
+        push!(unique_children, child)
+    end
+
+    # Stable, so ties keep the order in which the children were generated
+    sort!(unique_children, by=child -> -child.it_data.solution.load_shed)
+    return unique_children[1:min(cliargs["beam_width"], length(unique_children))]
+end
+
+""" key of the state reached by a partial sequence """
+function beam_state_key(it_data::IterData; digits=6)
+    rounded(d) = sort!([(to_index(i), round(v; digits=digits)) for (i, v) in d])
+    return (sort(it_data.lines),
+        rounded(it_data.prev_gen_setpoints), rounded(it_data.prev_loads))
+end
+
+""" lines that may extend a partial sequence, per cliargs["candidate_filter"] """
+function get_beam_candidates(cliargs::Dict, data::Dict, ref::Dict, node::BeamNode)
+    branches = if cliargs["candidate_filter"] == "pf"
+        get_top_pfs(data, ref, node.it_data, cliargs["inner_solver"];
+            init=false,
+            n=cliargs["candidates"],
+            percent_change=cliargs["generator_ramping_bounds"])
+    elseif cliargs["candidate_filter"] == "all"
+        sort(collect(keys(ref[:branch])))
+    else
+        @error "Unknown candidate filter ($(cliargs["candidate_filter"])); must be one of [pf|all]"
+        exit()
+    end
+    return [i for i in branches if !in(i, node.it_data.lines)]
+end
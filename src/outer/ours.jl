@@ -10,6 +10,9 @@ end
 
 """ solve with lazy constraint callback """
 function solve_approach(cliargs::Dict, data::Dict, ref::Dict)
+    start_time = time()
+    (cliargs["beam_width"] > 0) && return solve_approach_beam(cliargs, data, ref)
+
     # Cache the generator setpoints and loads at equilibrium
     setpoints = Dict(i => gen["pg"] for (i, gen) in ref[:gen])
     loads = Dict(i => load["pd"] for (i, load) in ref[:load])
@@ -20,7 +23,7 @@ function solve_approach(cliargs::Dict, data::Dict, ref::Dict)
     # This is only possible since we cache values in put_system_at_equilibrium
     pfs = get_top_pfs(data, ref, init_it_data, cliargs["inner_solver"];
             init=true,
-            n=10,
+            n=min(cliargs["roots"], length(ref[:branch])),
             # n=div(length(ref[:branch]), 10),
             percent_change=cliargs["generator_ramping_bounds"])
 
@@ -32,60 +35,144 @@ function solve_approach(cliargs::Dict, data::Dict, ref::Dict)
     # init_it_data = IterData([], loads, Dict(), setpoints, Dict(), Solution())
     # ldtw = get_ldtw(ref, init_it_data; n=10)
 
+    # Anytime mode: stop exploring roots at the deadline
+    if cliargs["deadline"] > 0
+        return solve_approach_anytime(cliargs, data, ref, pfs;
+            deadline=start_time + cliargs["deadline"])
+    end
+
+    # Roots are independent, so they are explored on threads
+    root_solutions = threaded_map(pfs) do p0
+        solve_approach_root(cliargs, data, ref, p0)
+    end
+
     solutions = Dict()
-    for p0 in pfs
+    for soln in root_solutions
+        solutions[soln.lines] = soln
+    end
 
-        # Reset the setpoints, loads
-        setpoints = Dict(i => gen["pg"] for (i, gen) in ref[:gen])
-        loads = Dict(i => load["pd"] for (i, load) in ref[:load])
-        pf = Dict(i => br["pf"] for (i,br) in ref[:branch])
+    return pack_permutation_solution(solutions)
+end
 
-        permutation = []
-        it_data = IterData(loads, setpoints, pf)
+"""
+Explore the roots in priority (power flow) order on threads until the deadline
+(in seconds since the epoch). Every completed sequence and the best load shed so
+far are streamed to the incumbent log. A root that is not complete at the
+deadline is dropped after its current step.
+"""
+function solve_approach_anytime(cliargs::Dict, data::Dict, ref::Dict, pfs;
+    deadline=Inf)
+    incumbents = IncumbentLog(cliargs)
+    solutions = Dict()
 
-        branches = nothing
+    next_root = Threads.Atomic{Int}(1)
+    @sync for _ in 1:min(Threads.nthreads(), length(pfs))
+        Threads.@spawn while time() < deadline
+            r = Threads.atomic_add!(next_root, 1)
+            (r > length(pfs)) && break
 
-        for i in 1:cliargs["line_budget"]
-            iter_lines = i == 1 ? [p0] : get_top_impacts(data, ref, it_data, 
-                cliargs["inner_solver"]; 
-                branches=branches,
-                percent_change=cliargs["generator_ramping_bounds"])
-            push!(permutation, iter_lines)
-            it_data.lines = collect(Iterators.flatten(permutation))
+            soln = solve_approach_root(cliargs, data, ref, pfs[r];
+                deadline=deadline)
+            (soln === nothing) && continue
+
+            lock(incumbents.lock) do
+                solutions[soln.lines] = soln
+                log_incumbent!(incumbents, soln)
+            end
+        end
+    end
 
-            DEBUG && println("Solving with k (subset) lines=$(it_data.lines)")
-            solve_partial_interdiction(cliargs, data, ref, it_data)
+    DEBUG && println("Completed $(length(solutions)) of $(length(pfs)) roots")
+    isempty(solutions) && return PermutationResults()
+    return pack_permutation_solution(solutions)
+end
 
-            # Get branches with high pf 
-            branches = get_top_pfs(data, ref, it_data, cliargs["inner_solver"]; 
-                    init=false,
-                    n=10,
-                    # n=div(length(ref[:branch]), 10),
-                    percent_change=cliargs["generator_ramping_bounds"])
+""" data class that streams completed sequences to a file """
+mutable struct IncumbentLog
+    file::String
+    start_time::Float64
+    best_load_shed::Float64
+    lock::ReentrantLock
+end
 
-            println("branches ", branches)
+function IncumbentLog(cliargs::Dict)
+    case = first(split(cliargs["case"], "."))
+    prob = cliargs["problem"][1:4]
+    k = cliargs["budget"]
+    pc = cliargs["generator_ramping_bounds"]
+    file = cliargs["output_path"] * "log/$(case)_$(prob)_incumbents_k$(k)_pc$(pc).csv"
+    open(f -> write(f, "time,load_shed,best_load_shed,perm\n"), file, "w")
+    return IncumbentLog(file, time(), -Inf, ReentrantLock())
+end
 
-        end
+""" append a completed sequence (and the best load shed so far) to the log """
+function log_incumbent!(incumbents::IncumbentLog, soln::Solution)
+    incumbents.best_load_shed = max(incumbents.best_load_shed, soln.load_shed)
+    elapsed = round(time() - incumbents.start_time; digits=2)
+    ls = round(soln.load_shed; digits=4)
+    best = round(incumbents.best_load_shed; digits=4)
+    pstr = join((join(x, ";") for x in soln.lines), "/")
+    open(f -> write(f, "$(elapsed),$(ls),$(best),$(pstr)\n"), incumbents.file, "a")
+end
+
+"""
+build the sequence of line_budget steps that starts by cutting p0; nothing if
+the deadline (in seconds since the epoch) passes before it is complete
+"""
+function solve_approach_root(cliargs::Dict, data::Dict, ref::Dict, p0;
+    deadline=Inf)
+    # Reset the setpoints, loads
+    setpoints = Dict(i => gen["pg"] for (i, gen) in ref[:gen])
+    loads = Dict(i => load["pd"] for (i, load) in ref[:load])
+    pf = Dict(i => br["pf"] for (i,br) in ref[:branch])
+
+    permutation = []
+    it_data = IterData(loads, setpoints, pf)
+    stats = Dict{Symbol,Any}()
+
+    branches = nothing
+
+    for i in 1:cliargs["line_budget"]
+        (time() >= deadline) && return nothing
+
+        iter_lines = i == 1 ? [p0] : get_top_impacts(data, ref, it_data, 
+            cliargs["inner_solver"]; 
+            branches=branches,
+            stats=stats,
+            percent_change=cliargs["generator_ramping_bounds"])
+        push!(permutation, iter_lines)
+        it_data.lines = collect(Iterators.flatten(permutation))
+
+        DEBUG && println("Solving with k (subset) lines=$(it_data.lines)")
+        solve_partial_interdiction(cliargs, data, ref, it_data)
+
+        # Get branches with high pf 
+        branches = get_top_pfs(data, ref, it_data, cliargs["inner_solver"]; 
+                init=false,
+                n=10,
+                # n=div(length(ref[:branch]), 10),
+                percent_change=cliargs["generator_ramping_bounds"])
+
+        println("branches ", branches)
 
-        # Last step should always be cut impact
-        # iter_lines = get_top_impacts(data, ref, it_data, 
-        #         cliargs["inner_solver"]; 
-        #         percent_change=cliargs["generator_ramping_bounds"])
-        # push!(permutation, iter_lines)
-        # it_data.lines = collect(Iterators.flatten(permutation))
-        # DEBUG && println("Solving with k (subset) lines=$(it_data.lines)")
-        # solve_partial_interdiction(cliargs, data, ref, it_data)
-
-        # Save the solution at the end of all rounds
-        solutions[permutation] = Solution(
-            permutation,
-            [],
-            it_data.solution.load_shed,
-            it_data.solution.stats
-        )
     end
 
-    return pack_permutation_solution(solutions)
+    # Last step should always be cut impact
+    # iter_lines = get_top_impacts(data, ref, it_data, 
+    #         cliargs["inner_solver"]; 
+    #         percent_change=cliargs["generator_ramping_bounds"])
+    # push!(permutation, iter_lines)
+    # it_data.lines = collect(Iterators.flatten(permutation))
+    # DEBUG && println("Solving with k (subset) lines=$(it_data.lines)")
+    # solve_partial_interdiction(cliargs, data, ref, it_data)
+
+    # Save the solution at the end of all rounds
+    return Solution(
+        permutation,
+        [],
+        it_data.solution.load_shed,
+        merge(it_data.solution.stats, stats)
+    )
 end
 
 function get_top_pfs(data, ref, it_data, solver; 
@@ -101,51 +188,73 @@ function get_top_pfs(data, ref, it_data, solver;
         pf = cut_info.p
     end
     pfs = sort(collect(pf), by=x -> (-x[2],x[1]))
-    return map(first, pfs[1:n])
+    return map(first, pfs[1:min(n, length(pfs))])
 end
 
-""" return the next component to cut (the line with the most impact)"""
+"""
+return the next component to cut (the line with the most impact); the number
+of candidates evaluated with and without an inner solve is added to stats
+"""
 function get_top_impacts(data, ref, it_data, solver; 
-        branches=nothing, n=1, percent_change=0.1)
+        branches=nothing, n=1, percent_change=0.1, stats=nothing)
     impacts = Dict()
 
     println("Branches = $(branches)")
     (branches == nothing) && (branches = keys(ref[:branch]))
 
-    for i in branches
-        br = ref[:branch][i]
-        in(i, it_data.lines) && continue
+    all_candidates = [i for i in branches if !in(i, it_data.lines)]
 
-        cut_info = get_permutation_inner_solution(
+    # Candidates whose outage the network absorbs need no inner solve
+    screened = screen_impacts(data, ref, it_data, all_candidates;
+        percent_change=percent_change)
+    candidates = [i for i in all_candidates if !haskey(screened, i)]
+
+    # Candidates are evaluated on threads; results are added in serial order
+    evaluate(i) = get_permutation_inner_solution(
             data, ref, [], [it_data.lines..., i], it_data;
             percent_change=percent_change, solver=solver
-        )
-
-        impacts[i] = cut_info.load_shed
-    end
-
-    return map(first, sort(collect(impacts), by=x -> -x[2])[1:n])
-end
+        ).load_shed
 
-""" return the component that would push the criticality up the most """
-function get_top_criticality(data, ref, it_data, solver; 
-        n=1, percent_change=0.1)
+    load_sheds = threaded_map(evaluate, candidates)
 
-    crits = Dict()
+    # Impacts are added in serial order, screened or not
+    solved = Dict(zip(candidates, load_sheds))
+    for i in all_candidates
+        haskey(screened, i) && (impacts[i] = screened[i])
+        haskey(solved, i) && (impacts[i] = solved[i])
+    end
 
-    for (i,br) in ref[:branch]
-        in(i, it_data.lines) && continue
+    DEBUG && println("Screened $(length(screened)) candidates, ",
+        "solved $(length(candidates))")
+    if stats !== nothing
+        stats[:evaluations] = get(stats, :evaluations, 0) + length(candidates)
+        stats[:screened_evaluations] =
+            get(stats, :screened_evaluations, 0) + length(screened)
+    end
 
-        cut_info = get_permutation_inner_solution(
-            data, ref, [], [it_data.lines..., i], it_data;
-            percent_change=percent_change, solver=solver
-        )
+    # Ties go to the lowest line id
+    return map(first, sort(collect(impacts), by=x -> (-x[2], x[1]))[1:n])
+end
 
-        crits[i] = criticality(ref, cut_info.p, cut_info.pg, percent_change)
+"""
+Load shed of the candidates whose outage the network absorbs: if the flows
+after the outage (see get_sensitivity_flows) stay within limits with the
+generators at their setpoints and the loads served, that dispatch is optimal
+for the inner problem. Since lost load is not recovered, its load shed is the
+least of any candidate; every other candidate needs an inner solve
+"""
+function screen_impacts(data, ref, it_data, candidates; percent_change=0.1)
+    screened = Dict()
+    (get_dc_sensitivities(ref) === nothing) && return screened
+
+    load_shed = data["total_load"] - sum(values(it_data.prev_loads); init=0.0)
+    for i in candidates
+        flows = get_sensitivity_flows(ref, [it_data.lines..., i],
+            it_data.prev_gen_setpoints, it_data.prev_loads;
+            percent_change=percent_change)
+        (flows !== nothing) && (screened[i] = load_shed)
     end
-    println("Criticality = $(crits)")
-
-    return map(first, sort(collect(crits), by=x -> -x[2])[1:n])
+    return screened
 end
 
 function get_ldtw(ref, it_data; n=1)
@@ -19,19 +19,33 @@ function solve_permutation(cliargs::Dict, data::Dict, ref::Dict)
     nk_solution = solve_traditional(cliargs, data, ref)
     lines = nk_solution.solution.lines
 
-    solutions = Dict()
-    for porder in permutations(lines)
-        permutation = []
-        it_data = IterData(loads, setpoints, pf)
+    # Evaluate all orders of the lines, sharing the solves of common prefixes
+    it_data = IterData(loads, setpoints, pf)
+    solutions = solve_orders(cliargs, data, ref, lines, length(lines), it_data)
 
-        for iter_lines in take_n_items(porder, cliargs["iterline_budget"])
-            push!(permutation, iter_lines)
-            it_data.lines = collect(Iterators.flatten(permutation))
+    return pack_permutation_solution(solutions)
+end
 
-            DEBUG && println("Solving with k (subset) lines=$(it_data.lines)")
-            solve_partial_interdiction(cliargs, data, ref, it_data)
-        end
+"""
+Solve every order of k lines taken from `lines`, in steps of iterline_budget
+lines, with a depth-first search over the tree of prefixes. Each distinct
+prefix is solved once and its IterData is branched from, so orders such as
+[3,7,1] and [3,7,9] share the solves of [3] and [3,7]. If `on_error` is given,
+it is called with the exception and the step is skipped (as in enumeration).
+The topology of each prefix is updated incrementally and undone on backtrack.
+"""
+function solve_orders(cliargs::Dict, data::Dict, ref::Dict, lines, k::Int,
+    it_data::IterData; on_error=nothing)
+    solutions = Dict()
+    it_data = with_topology(it_data, ref)
+    _solve_orders!(solutions, cliargs, data, ref, collect(lines), k, [],
+        it_data, on_error)
+    return solutions
+end
 
+function _solve_orders!(solutions, cliargs, data, ref, remaining, k,
+    permutation, it_data, on_error)
+    if k == 0 || isempty(remaining)
         # Save the solution at the end of all rounds
         solutions[permutation] = Solution(
             permutation,
@@ -39,9 +53,46 @@ function solve_permutation(cliargs::Dict, data::Dict, ref::Dict)
             it_data.solution.load_shed,
             it_data.solution.stats
         )
+        return
     end
 
-    return pack_permutation_solution(solutions)
+    # The state after a step only depends on the set of lines in that step
+    m = min(cliargs["iterline_budget"], k, length(remaining))
+    for step in combinations(remaining, m)
+        _solve_step!(solutions, cliargs, data, ref, remaining, k,
+            permutation, it_data, step, on_error)
+    end
+end
+
+""" solve the step that fails the lines in `step` once; expand all its orders """
+function _solve_step!(solutions, cliargs, data, ref, remaining, k,
+    permutation, it_data, step, on_error)
+    next_it_data = copy(it_data)
+    next_it_data.lines = [it_data.lines..., step...]
+
+    for l in step
+        remove_branch!(it_data.topology, l)
+    end
+    try
+        DEBUG && println("Solving with k (subset) lines=$(next_it_data.lines)")
+        try
+            solve_partial_interdiction(cliargs, data, ref, next_it_data)
+        catch e
+            (on_error === nothing) && rethrow()
+            on_error(e)
+        end
+
+        rest = setdiff(remaining, step)
+        for iter_lines in permutations(step)
+            _solve_orders!(solutions, cliargs, data, ref, rest, k - length(step),
+                Any[permutation..., iter_lines], next_it_data, on_error)
+        end
+    finally
+        # Backtrack: restore the lines of this step
+        for _ in step
+            undo!(it_data.topology)
+        end
+    end
 end
 
 function pack_permutation_solution(solutions)
@@ -67,48 +118,103 @@ function pack_permutation_solution(solutions)
     )
 end
 
-""" solve the interdiction problem with part of the lines cut """
+"""
+solve the interdiction problem with part of the lines cut; without fast_path,
+the outer MILP is solved even if it has one feasible point
+"""
 function solve_partial_interdiction(cliargs::Dict, data::Dict, ref::Dict,
-    it_data::IterData)
+    it_data::IterData; fast_path=true)
 
-    model = direct_model(Gurobi.Optimizer(Gurobi.Env()))
+    # All lines are fixed and no generator can be cut: skip the outer MILP
+    if fast_path && is_partial_interdiction_fixed(cliargs, it_data)
+        return solve_fixed_partial_interdiction(cliargs, data, ref, it_data)
+    end
 
-    attributes_outer_model(model, cliargs)
+    return with_gurobi_model() do model
 
-    variable_outer_interdiction(model, ref)
+        attributes_outer_model(model, cliargs)
 
-    # Set interdicted lines 
-    constraint_outer_partial_budget(model, cliargs, length(it_data.lines))
-    constraint_outer_failed_lines(model, it_data.lines)
+        variable_outer_interdiction(model, ref)
 
-    objective_outer_load_shed(model)
+        # Set interdicted lines 
+        constraint_outer_partial_budget(model, cliargs, length(it_data.lines))
+        constraint_outer_failed_lines(model, it_data.lines)
 
-    # Create a lazy callback for the inner problem; update it_data in callback
-    MOI.set(model, MOI.LazyConstraintCallback(),
-        (cb_data) -> cb_permutation_inner_problem(
-            cb_data, model, data, ref, it_data, cliargs["inner_solver"];
-            percent_change=cliargs["generator_ramping_bounds"])
-    )
+        objective_outer_load_shed(model)
+
+        # Seed the model with the cuts of earlier solves of this inner problem;
+        # this MILP is only solved with a generator budget (see above)
+        pool_key = cut_pool_key(:permutation, data, ref,
+            it_data.prev_gen_setpoints, it_data.prev_loads,
+            cliargs["generator_ramping_bounds"])
+        add_pooled_cuts!(model, CUT_POOL, pool_key)
+
+        # Create a lazy callback for the inner problem; update it_data in callback
+        MOI.set(model, MOI.LazyConstraintCallback(),
+            (cb_data) -> cb_permutation_inner_problem(
+                cb_data, model, data, ref, it_data, cliargs["inner_solver"];
+                percent_change=cliargs["generator_ramping_bounds"],
+                pool_key=pool_key)
+        )
+
+        JuMP.optimize!(model)
+
+        # Get the latest pg and load shed after optimization (and save it in prev)
+        it_data.prev_gen_setpoints = it_data.next_gen_setpoints
+        it_data.prev_loads = it_data.next_loads
+        it_data.prev_br_pf = it_data.next_br_pf
+
+        curr_lines = collect_values(model[:x_line], keys(ref[:branch]))
+        curr_gens = collect_values(model[:x_gen], keys(ref[:gen]))
+        objective_value = JuMP.objective_value(model)
+        # objective_value = recompute_objective_value(data, ref,
+        #     curr_lines, curr_gens, setpoints, cliargs)
+        it_data.solution = Solution(curr_lines, curr_gens, objective_value, Dict())
+
+        return nothing
+    end
+end
 
-    JuMP.optimize!(model)
+"""
+true if the partial interdiction has one feasible point: x_line is fixed for
+every line in it_data.lines, the partial budget equals their number and so no
+other line or generator can be cut
+"""
+function is_partial_interdiction_fixed(cliargs::Dict, it_data::IterData)
+    return allunique(it_data.lines) &&
+           (!cliargs["use_separate_budgets"] || cliargs["generator_budget"] == 0)
+end
 
-    # Get the latest pg and load shed after optimization (and save it in prev)
-    it_data.prev_gen_setpoints = it_data.next_gen_setpoints
-    it_data.prev_loads = it_data.next_loads
-    it_data.prev_br_pf = it_data.next_br_pf
+""" solve the inner problem of a fixed partial interdiction directly """
+function solve_fixed_partial_interdiction(cliargs::Dict, data::Dict, ref::Dict,
+    it_data::IterData)
+    # Orders whose flows stay within limits shed no load; skip the inner solve
+    cut_info = !cliargs["prefilter"] ? nothing :
+        get_sensitivity_inner_solution(data, ref, it_data;
+            percent_change=cliargs["generator_ramping_bounds"])
+    if cut_info === nothing
+        cut_info = get_permutation_inner_solution(
+            data, ref, [], it_data.lines, it_data;
+            percent_change=cliargs["generator_ramping_bounds"],
+            solver=cliargs["inner_solver"]
+        )
+    end
 
-    curr_lines = collect_values(model[:x_line], keys(ref[:branch]))
-    curr_gens = collect_values(model[:x_gen], keys(ref[:gen]))
-    objective_value = JuMP.objective_value(model)
-    # objective_value = recompute_objective_value(data, ref,
-    #     curr_lines, curr_gens, setpoints, cliargs)
-    it_data.solution = Solution(curr_lines, curr_gens, objective_value, Dict())
+    # Same updates as cb_permutation_inner_problem and the MILP path
+    it_data.prev_gen_setpoints = it_data.next_gen_setpoints = cut_info.pg
+    it_data.prev_loads = it_data.next_loads = cut_info.loads
+    it_data.prev_br_pf = it_data.next_br_pf = cut_info.p
 
-    return model
+    # The Woods cut is tight at the fixed point (cut lines carry no flow)
+    curr_lines = [i for i in keys(ref[:branch]) if in(i, it_data.lines)]
+    objective_value = round(cut_info.load_shed; digits=4)
+    it_data.solution = Solution(curr_lines, [], objective_value, Dict())
+
+    return nothing
 end
 
 function cb_permutation_inner_problem(cb_data, model, data, ref, it_data,
-    solver; percent_change=0.1)
+    solver; percent_change=0.1, pool_key=nothing)
     status = callback_node_status(cb_data, model)
     (status != MOI.CALLBACK_NODE_STATUS_INTEGER) && (return)
 
@@ -134,4 +240,7 @@ function cb_permutation_inner_problem(cb_data, model, data, ref, it_data,
         sum([cut_info.p[i] * x_line[i] for i in keys(cut_info.p)]))
 
     MOI.submit(model, MOI.LazyConstraint(cb_data), woods_cut)
+
+    (pool_key !== nothing) && add_cut!(CUT_POOL, pool_key,
+        WoodsCut(round(cut_info.load_shed; digits=4), Dict(), cut_info.p))
 end
@@ -23,9 +23,12 @@ function run_deterministic(cliargs::Dict, mp_file::String)::Results
     return solve_deterministic(cliargs, data, ref)
 end
 
-""" solve with lazy constraint callback """
-function solve_deterministic(cliargs::Dict, data::Dict, ref::Dict)::Results
-    model = direct_model(Gurobi.Optimizer(Gurobi.Env()))
+""" solve with lazy constraint callback, with a pooled Gurobi environment """
+solve_deterministic(cliargs::Dict, data::Dict, ref::Dict)::Results =
+    with_gurobi_model(model -> solve_deterministic(cliargs, data, ref, model))
+
+function solve_deterministic(cliargs::Dict, data::Dict, ref::Dict,
+    model::JuMP.Model)::Results
     # set_attribute(model, "LogToConsole", 0)
     set_attribute(model, "TimeLimit", cliargs["timeout"])
     MOI.set(model, MOI.RelativeGapTolerance(), cliargs["optimality_gap"] / 100.0)
@@ -0,0 +1,131 @@
+# time-expanded.jl
+#
+# Search over the orders of sequential N-k with one time-indexed branch-and-cut:
+# x_line[t, l] is 1 if line l fails in step t, so the solver searches the orders
+# instead of us enumerating them. The MILP has no dispatch, setpoint or ramping
+# variables. An integer attack is evaluated step by step in the callback, as in
+# permutation (the setpoints of step t bound those of step t + 1 by the ramping
+# bound, and lost load is not recovered), and is cut off by a time-indexed
+# Woods-style cut. These cuts are not valid upper bounds in general, so this is
+# a callback approximation of the sequential problem, not an exact model of the
+# coupled dispatch.
+
+""" run the time-indexed callback search over sequential N-k orders """
+function run_time_expanded(cliargs::Dict, mp_file::String)::PermutationResults
+    data, ref = init_models_data_ref(
+        mp_file;
+        do_perturb_loads=cliargs["do_perturb_loads"])
+    return solve_time_expanded(cliargs, data, ref)
+end
+
+""" number of lines that fail in each step of the attack """
+function get_time_expanded_steps(cliargs::Dict)
+    k = cliargs["use_separate_budgets"] ? cliargs["line_budget"] : cliargs["budget"]
+    m = cliargs["iterline_budget"]
+    return [min(m, k - (t - 1) * m) for t in 1:cld(k, m)]
+end
+
+""" solve with lazy constraint callback """
+function solve_time_expanded(cliargs::Dict, data::Dict, ref::Dict)
+    # Cache the generator setpoints and loads at equilibrium
+    setpoints = Dict(i => gen["pg"] for (i, gen) in ref[:gen])
+    loads = Dict(i => load["pd"] for (i, load) in ref[:load])
+    pf = Dict(i => br["pf"] for (i,br) in ref[:branch])
+
+    # Generators are not interdicted in the sequential problems
+    cliargs["use_separate_budgets"] && (cliargs["generator_budget"] > 0) &&
+        @warn "time-expanded N-k only fails lines; ignoring the generator budget"
+
+    steps = get_time_expanded_steps(cliargs)
+    T = length(steps)
+
+    # Every attack evaluated in the callback, by its order
+    solutions = Dict()
+
+    return with_gurobi_model() do model
+
+        attributes_outer_model(model, cliargs)
+
+        # x_line[t, l] = 1 if l fails in step t; y_line[t, l] = 1 if l is out in step t
+        @variable(model, x_line[t in 1:T, l in keys(ref[:branch])], Bin)
+        @expression(model, y_line[t in 1:T, l in keys(ref[:branch])],
+            sum(x_line[s, l] for s in 1:t))
+
+        for t in 1:T
+            @constraint(model, sum(x_line[t, l] for l in keys(ref[:branch])) == steps[t])
+        end
+        for l in keys(ref[:branch])
+            @constraint(model, sum(x_line[t, l] for t in 1:T) <= 1)
+        end
+
+        # Set failed lines if given (in any step)
+        if cliargs["failed"] != ""
+            for l in map(x -> parse(Int, x), split(cliargs["failed"], ","))
+                @constraint(model, y_line[T, l] == 1)
+            end
+        end
+
+        objective_outer_load_shed(model)
+
+        MOI.set(model, MOI.LazyConstraintCallback(),
+            (cb_data) -> cb_time_expanded_inner_problem(
+                cb_data, model, cliargs, data, ref,
+                IterData(loads, setpoints, pf), solutions)
+        )
+
+        JuMP.optimize!(model)
+
+        return pack_time_expanded_solution(model, solutions)
+    end
+end
+
+"""
+Evaluate the integer attack of the callback step by step; the cut bounds the
+load shed of any attack by that of this one plus the flow (at each step) of
+the lines that it fails earlier. As with the other Woods cuts, this is a
+heuristic bound for the DC load shed model
+"""
+function cb_time_expanded_inner_problem(cb_data, model, cliargs, data, ref,
+    it_data, solutions)
+    status = callback_node_status(cb_data, model)
+    (status != MOI.CALLBACK_NODE_STATUS_INTEGER) && (return)
+
+    x_line, y_line = model[:x_line], model[:y_line]
+    T = first(size(x_line))
+    order = Any[sort(collect_values(x_line[t, :], keys(ref[:branch]); cb_data=cb_data))
+                for t in 1:T]
+
+    # The flows of each step; lines that are out carry no flow
+    flows = Dict{Int,Dict}()
+    for (t, step) in enumerate(order)
+        it_data = copy(it_data)
+        it_data.lines = [it_data.lines..., step...]
+        solve_fixed_partial_interdiction(cliargs, data, ref, it_data)
+        flows[t] = it_data.prev_br_pf
+    end
+
+    load_shed = it_data.solution.load_shed
+    solutions[order] = Solution(order, [], load_shed, Dict())
+    DEBUG && println("Time-expanded order=$(order), load shed=$(load_shed)")
+
+    woods_cut = @build_constraint(
+        model[:eta]
+        <=
+        load_shed +
+        sum([p * y_line[t, l] for t in 1:T for (l, p) in flows[t]]))
+    MOI.submit(model, MOI.LazyConstraint(cb_data), woods_cut)
+end
+
+""" the orders evaluated by the solver, with the statistics of the MILP """
+function pack_time_expanded_solution(model, solutions)
+    iterations = Int(MOI.get(model, MOI.NodeCount()))
+    objective_value = JuMP.objective_value(model)
+    bound = JuMP.objective_bound(model)
+    run_time = JuMP.solve_time(model)
+    rel_gap = JuMP.relative_gap(model)
+
+    return PermutationResults(
+        iterations, objective_value, bound, run_time, rel_gap,
+        pack_permutation_solution(solutions).solution
+    )
+end
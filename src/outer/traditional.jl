@@ -13,33 +13,163 @@ function run_traditional(cliargs::Dict, mp_file::String)::Results
     return solve_traditional(cliargs, data, ref)
 end
 
-""" solve with lazy constraint callback """
-function solve_traditional(cliargs::Dict, data::Dict, ref::Dict)
+"""
+run traditional N-k for each budget in ks on one parsed case. The MIP start of
+the next budget is the solution of the previous one plus the lines with the
+most flow after it. Pooled cuts are not used: the Woods cuts are not valid
+upper bounds, so cuts of another budget could change the result of a budget
+from that of an independent run
+"""
+function run_traditional_sweep(cliargs::Dict, mp_file::String, ks)::Dict{Int,Results}
+    data, ref = init_models_data_ref(
+        mp_file; 
+        do_perturb_loads=cliargs["do_perturb_loads"])
+    setpoints = Dict(i => gen["pg"] for (i, gen) in ref[:gen])
+
+    sweep_args = copy(cliargs)
+    g = cliargs["use_separate_budgets"] ? cliargs["generator_budget"] : 0
+
+    results = Dict{Int,Results}()
+    start_lines = nothing
+    for k in sort(collect(ks))
+        sweep_args["budget"] = k
+        sweep_args["line_budget"] = k - g
+
+        if start_lines !== nothing
+            add_greedy_flow_lines!(sweep_args, data, ref, setpoints,
+                start_lines, k - g)
+            (length(start_lines) != k - g) && (start_lines = nothing)
+        end
+
+        DEBUG && println("Sweep with k=$(k)")
+        results[k] = solve_traditional(sweep_args, data, ref;
+            start_lines=start_lines, pooled_cuts=false)
+
+        # Generators cannot be part of the MIP start
+        start_lines = (g == 0) ? copy(results[k].solution.lines) : nothing
+    end
+
+    return results
+end
+
+"""
+solve with lazy constraint callback; start_lines (or cliargs["mip_start"])
+gives the lines of a MIP start, and the model is seeded with the cuts of the
+cut pool unless pooled_cuts is false
+"""
+function solve_traditional(cliargs::Dict, data::Dict, ref::Dict;
+    start_lines=nothing, pooled_cuts=true)
     # Cache the generator setpoints at equilibrium
     setpoints = Dict(i => gen["pg"] for (i, gen) in ref[:gen])
 
-    model = direct_model(Gurobi.Optimizer(Gurobi.Env()))
+    if start_lines === nothing && cliargs["mip_start"] != "none"
+        start_lines = get_mip_start_lines(cliargs, data, ref, setpoints)
+    end
 
-    attributes_outer_model(model, cliargs)
+    return with_gurobi_model() do model
 
-    variable_outer_interdiction(model, ref)
-    constraint_outer_interdiction_budget(model, cliargs)
+        attributes_outer_model(model, cliargs)
 
-    # Set failed lines if given
-    constraint_outer_failed_lines(model, cliargs["failed"])
+        variable_outer_interdiction(model, ref)
+        constraint_outer_interdiction_budget(model, cliargs)
 
-    objective_outer_load_shed(model)
+        # Set failed lines if given
+        constraint_outer_failed_lines(model, cliargs["failed"])
 
-    # Create a lazy callback for the inner problem
-    MOI.set(model, MOI.LazyConstraintCallback(),
-        (cb_data) -> cb_traditional_inner_problem(
-            cb_data, model, data, ref, setpoints, cliargs["inner_solver"];
-            percent_change=cliargs["generator_ramping_bounds"])
-    )
+        objective_outer_load_shed(model)
+
+        # Seed the model with the cuts of earlier solves of this inner problem;
+        # the disk cache uses a pool of its own if the shared pool is disabled
+        pool_key = cut_pool_key(:traditional, data, ref, setpoints, Dict(),
+            cliargs["generator_ramping_bounds"])
+        cut_file = cut_cache_file(cliargs, pool_key)
+        pool = (cliargs["cut_cache"] && CUT_POOL.cuts.capacity <= 0) ? CutPool(1) : CUT_POOL
+        if pooled_cuts
+            cliargs["cut_cache"] && load_cut_cache!(pool, pool_key, cut_file)
+            add_pooled_cuts!(model, pool, pool_key)
+        end
+
+        # Start from a heuristic incumbent
+        (start_lines !== nothing) &&
+            set_mip_start!(model, cliargs, data, ref, setpoints, start_lines)
 
-    JuMP.optimize!(model)
+        # Create a lazy callback for the inner problem
+        MOI.set(model, MOI.LazyConstraintCallback(),
+            (cb_data) -> cb_traditional_inner_problem(
+                cb_data, model, data, ref, setpoints, cliargs["inner_solver"];
+                percent_change=cliargs["generator_ramping_bounds"],
+                pool=pool, pool_key=pool_key)
+        )
 
-    return pack_solution(model, data, ref, setpoints, cliargs)
+        JuMP.optimize!(model)
+        cliargs["cut_cache"] && save_cut_cache(pool, pool_key, cut_file)
+
+        return pack_solution(model, data, ref, setpoints, cliargs)
+    end
+end
+
+"""
+Lines of a heuristic MIP start: the failed lines, then either the lines with
+the most flow at equilibrium ("flow") or, one at a time, the line with the most
+flow after the lines chosen so far are cut ("greedy_flow")
+"""
+function get_mip_start_lines(cliargs::Dict, data::Dict, ref::Dict, setpoints)
+    # Generators cannot be chosen by these heuristics
+    cliargs["use_separate_budgets"] && (cliargs["generator_budget"] > 0) &&
+        return nothing
+
+    lines = (cliargs["failed"] == "") ? Int[] :
+            map(x -> parse(Int, x), split(cliargs["failed"], ","))
+    k = cliargs["use_separate_budgets"] ? cliargs["line_budget"] : cliargs["budget"]
+
+    if cliargs["mip_start"] == "flow"
+        pfs = sort(collect(keys(ref[:branch])), by=i -> (-abs(ref[:branch][i]["pf"]), i))
+        for i in pfs
+            (length(lines) >= k) && break
+            in(i, lines) || push!(lines, i)
+        end
+    elseif cliargs["mip_start"] == "greedy_flow"
+        add_greedy_flow_lines!(cliargs, data, ref, setpoints, lines, k)
+    else
+        @error "Unknown MIP start ($(cliargs["mip_start"])); must be one of [none|flow|greedy_flow]"
+        exit()
+    end
+
+    return (length(lines) == k) ? lines : nothing
+end
+
+""" add the line with the most flow after cutting lines until there are k """
+function add_greedy_flow_lines!(cliargs::Dict, data::Dict, ref::Dict, setpoints,
+    lines::Vector, k::Int)
+    while length(lines) < k
+        cut_info = get_traditional_inner_solution(
+            data, ref, [], lines, setpoints;
+            percent_change=cliargs["generator_ramping_bounds"],
+            solver=cliargs["inner_solver"])
+        isempty(cut_info.p) && break
+        push!(lines, maximum(x -> (x[2], x[1]), cut_info.p)[2])
+    end
+    return lines
+end
+
+""" set the MIP start to cutting lines; eta starts at their load shed """
+function set_mip_start!(model, cliargs, data, ref, setpoints, lines)
+    cut_info = get_traditional_inner_solution(
+        data, ref, [], lines, setpoints;
+        percent_change=cliargs["generator_ramping_bounds"],
+        solver=cliargs["inner_solver"])
+
+    # The Woods cut at this point is tight (cut lines carry no flow)
+    load_shed = round(cut_info.load_shed; digits=4)
+    for i in keys(ref[:branch])
+        JuMP.set_start_value(model[:x_line][i], in(i, lines) ? 1.0 : 0.0)
+    end
+    for i in keys(ref[:gen])
+        JuMP.set_start_value(model[:x_gen][i], 0.0)
+    end
+    JuMP.set_start_value(model[:eta], load_shed)
+
+    DEBUG && println("MIP start lines=$(lines), load shed=$(load_shed)")
 end
 
 function pack_solution(model, data, ref, setpoints, cliargs)
@@ -63,7 +193,7 @@ function pack_solution(model, data, ref, setpoints, cliargs)
 end
 
 function cb_traditional_inner_problem(cb_data, model, data, ref, setpoints,
-    solver; percent_change=0.1)
+    solver; percent_change=0.1, pool=CUT_POOL, pool_key=nothing)
     status = callback_node_status(cb_data, model)
     (status != MOI.CALLBACK_NODE_STATUS_INTEGER) && (return)
 
@@ -85,4 +215,7 @@ function cb_traditional_inner_problem(cb_data, model, data, ref, setpoints,
         sum([cut_info.pg[i] * x_gen[i] for i in keys(cut_info.pg)]) +
         sum([cut_info.p[i] * x_line[i] for i in keys(cut_info.p)]))
     MOI.submit(model, MOI.LazyConstraint(cb_data), woods_cut)
+
+    (pool_key !== nothing) && add_cut!(pool, pool_key,
+        WoodsCut(round(cut_info.load_shed; digits=4), cut_info.pg, cut_info.p))
 end
@@ -28,7 +28,7 @@ function parse_commandline()
         default = "$(project_base)output/"
 
         "--problem"
-        help = "problem selection - traditional/permutation/enumeration"
+        help = "problem selection - traditional/permutation/enumeration/time_expanded/SEQUIN/criticality/flow/impact"
         arg_type = String
         default = "permutation"
 
@@ -113,6 +113,83 @@ function parse_commandline()
         help = "Number of times to repeat experiments"
         arg_type = Int
         default = 1
+
+        "--sweep"
+        help = "Parse the case once and sweep the scenarios of an experiment"
+        action = :store_true
+        default = false
+
+        "--inner_cache_size"
+        help = "number of inner (and island) solutions to memoize (0 disables the caches)"
+        arg_type = Int
+        default = 1024
+
+        "--cut_pool_size"
+        help = "number of inner problems whose Woods cuts are pooled (0, the default, disables the pool)"
+        arg_type = Int
+        default = 0
+
+        "--workers"
+        help = "number of processes for the enumeration N-k"
+        arg_type = Int
+        default = 1
+
+        "--shard"
+        help = "shard of the enumeration N-k solved by this process (internal)"
+        arg_type = Int
+        default = 0
+
+        "--shard_cliargs"
+        help = "file with the cliargs of the coordinator of the shards (internal)"
+        arg_type = String
+        default = nothing
+
+        "--roots"
+        help = "number of top power flow lines that SEQUIN starts sequences from"
+        arg_type = Int
+        default = 10
+
+        "--beam_width"
+        help = "number of partial sequences kept by SEQUIN at each step (0 is greedy)"
+        arg_type = Int
+        default = 0
+
+        "--candidate_filter"
+        help = "lines that may extend a sequence in the beam - pf/all"
+        arg_type = String
+        default = "pf"
+
+        "--candidates"
+        help = "number of top power flow lines used by the pf candidate filter"
+        arg_type = Int
+        default = 10
+
+        "--deadline"
+        help = "wall-clock budget of SEQUIN in seconds (0 for none)"
+        arg_type = Float64
+        default = 0.0
+
+        "--lazy_greedy"
+        help = "re-evaluate only the top line of greedy impact/criticality (CELF)"
+        action = :store_true
+
+        "--cut_cache"
+        help = "read/write the cuts of traditional N-k under output/cache/cuts"
+        action = :store_true
+
+        "--prefilter"
+        help = "skip the inner solve of orders whose flows stay within limits"
+        action = :store_true
+
+        "--mip_start"
+        help = "MIP start for traditional N-k - none/flow/greedy_flow"
+        arg_type = String
+        default = "none"
+
+        "--seed"
+        help = "seed for the load perturbation (sharded enumeration uses 0)"
+        arg_type = Int
+        default = nothing
         
     end
 
@@ -144,6 +221,13 @@ function validate_parameters(params)
         @error "iteration line budget ($m) is greater than line budget $(l)"
         exit()
     end
+
+    # The lines of time_expanded are the line budget (or the budget)
+    kl = params["use_separate_budgets"] ? l : k
+    if params["problem"] == "time_expanded" && !(1 <= m <= kl)
+        @error "iteration line budget ($m) must be between 1 and the line budget $(kl)"
+        exit()
+    end
 end
 
 function get_filenames_with_paths(params)
@@ -0,0 +1,156 @@
+# cutpool.jl
+#
+# Pool of the Woods cuts generated by the lazy constraint callbacks. A cut only
+# depends on the inner problem (case, setpoints, load caps and ramping bound),
+# not on the budget or the fixed lines, so outer models of the same inner
+# problem are seeded with the cuts that earlier solves generated. The cuts of
+# the least recently used inner problems are evicted (see --cut_pool_size).
+# Woods cuts are not valid upper bounds in general, so seeding a model with
+# them may change its result from that of a cold run; the pool is opt-in.
+
+""" a Woods cut: eta <= load_shed + sum(pg[i] x_gen[i]) + sum(p[l] x_line[l]) """
+struct WoodsCut
+    load_shed::Float64
+    pg::Dict{Int,Float64}
+    p::Dict{Int,Float64}
+end
+
+""" the cuts of one inner problem, with the hashes of the cuts to skip duplicates """
+const PooledCuts = NamedTuple{(:cuts, :seen),Tuple{Vector{WoodsCut},Set{UInt}}}
+
+""" data class that holds the cuts, by the inner problem they are valid for """
+mutable struct CutPool
+    cuts::LRUCache{Any,PooledCuts}
+    lock::ReentrantLock
+end
+
+CutPool(capacity::Int) = CutPool(LRUCache{Any,PooledCuts}(capacity), ReentrantLock())
+
+# Disabled unless --cut_pool_size is given (see set_cut_pool_capacity!)
+const CUT_POOL = CutPool(0)
+
+""" set the number of inner problems whose cuts are kept (0 disables the pool) """
+function set_cut_pool_capacity!(capacity::Int)
+    CUT_POOL.cuts.capacity = capacity
+    (capacity < length(CUT_POOL.cuts)) && empty!(CUT_POOL.cuts)
+end
+
+""" add a cut to the pool, unless the same cut is already there """
+function add_cut!(pool::CutPool, key, cut::WoodsCut)
+    h = hash((cut.load_shed, sort!(collect(cut.pg)), sort!(collect(cut.p))))
+    lock(pool.lock) do
+        entry = get(pool.cuts, key, nothing)
+        if entry === nothing
+            entry = (cuts=WoodsCut[], seen=Set{UInt}())
+            pool.cuts[key] = entry
+        end
+        (h in entry.seen) && return
+        push!(entry.seen, h)
+        push!(entry.cuts, cut)
+    end
+end
+
+""" cuts that are valid for the inner problem with the given key """
+function get_cuts(pool::CutPool, key)
+    return lock(pool.lock) do
+        entry = get(pool.cuts, key, nothing)
+        return (entry === nothing) ? WoodsCut[] : copy(entry.cuts)
+    end
+end
+
+""" add the pooled cuts of key to an outer model as regular constraints """
+function add_pooled_cuts!(model, pool::CutPool, key)
+    x_line, x_gen = model[:x_line], model[:x_gen]
+    cuts = get_cuts(pool, key)
+    for cut in cuts
+        @constraint(model,
+            model[:eta]
+            <=
+            cut.load_shed +
+            sum([cut.pg[i] * x_gen[i] for i in keys(cut.pg)]; init=0.0) +
+            sum([cut.p[i] * x_line[i] for i in keys(cut.p)]; init=0.0))
+    end
+    DEBUG && !isempty(cuts) && println("Seeded $(length(cuts)) pooled cuts")
+    return length(cuts)
+end
+
+""" key of the inner problem that a cut is valid for """
+function cut_pool_key(kind::Symbol, data, ref, setpoints, loads, percent_change)
+    return (kind, case_hash(data, ref), percent_change,
+        state_hash(setpoints), state_hash(loads))
+end
+
+"""
+hash of the data that the inner problem depends on; unlike case_id, equal for
+equal cases and stable across runs
+"""
+function case_hash(data, ref)
+    return lock(REF_LOCK) do
+        get!(ref, :case_hash) do
+            fields = (
+                bus=(),
+                branch=("f_bus", "t_bus", "br_x", "tap", "shift", "rate_a",
+                    "angmin", "angmax"),
+                gen=("gen_bus", "pmin", "pmax"),
+                load=("load_bus", "pd"),
+                shunt=("shunt_bus", "gs"))
+            io = IOBuffer()
+            print(io, data["total_load"])
+            for (component, names) in pairs(fields)
+                for i in sort(collect(keys(ref[component])))
+                    print(io, component, i, [get(ref[component][i], n, nothing)
+                                             for n in names])
+                end
+            end
+            return bytes2hex(sha1(take!(io)))
+        end
+    end
+end
+
+""" hash of a dict of setpoints or loads; keys may be ints or strings """
+function state_hash(d)
+    return bytes2hex(sha1(repr(sort!([(to_index(i), v) for (i, v) in d]))))
+end
+
+################################################################################
+# On-disk cut cache
+################################################################################
+
+""" file that caches the cuts of key (see cut_pool_key) under output/cache """
+function cut_cache_file(cliargs::Dict, key)
+    kind, chash, pc, shash, lhash = key
+    case = first(split(cliargs["case"], "."))
+    return cliargs["output_path"] * "cache/cuts/" *
+           "$(case)_$(kind)_$(chash[1:12])_pc$(pc)_$(shash[1:12])_$(lhash[1:12]).jls"
+end
+
+""" add the cuts cached in file to the pool; returns the number of cuts read """
+function load_cut_cache!(pool::CutPool, key, file::String)
+    isfile(file) || return 0
+    cache = try
+        deserialize(file)
+    catch e
+        @warn "ignoring unreadable cut cache $(file)" exception=e
+        return 0
+    end
+    # Only cuts of the same inner problem are valid
+    (get(cache, "key", nothing) == key) || return 0
+    for (load_shed, pg, p) in cache["cuts"]
+        add_cut!(pool, key, WoodsCut(load_shed, pg, p))
+    end
+    DEBUG && println("Read $(length(cache["cuts"])) cuts from $(file)")
+    return length(cache["cuts"])
+end
+
+""" write the pooled cuts of key to file; a pool without them leaves the file as it is """
+function save_cut_cache(pool::CutPool, key, file::String)
+    cuts = [(cut.load_shed, cut.pg, cut.p) for cut in get_cuts(pool, key)]
+    if isempty(cuts)
+        @warn "no cuts to cache in $(file)"
+        return
+    end
+    mkpath(dirname(file))
+    tmp = "$(file).$(getpid()).tmp"
+    serialize(tmp, Dict("key" => key, "cuts" => cuts))
+    mv(tmp, file; force=true)
+end
@@ -51,15 +51,23 @@ function perturb_loads!(data; by=0.01)
     end
 end
 
-""" solve the OPF solution for the data file and reset generation """
-function put_system_at_equilibrium!(data, mp_file)
-    lp_optimizer = JuMP.optimizer_with_attributes(
-        () -> Gurobi.Optimizer(Gurobi.Env()), "LogToConsole" => 0
-    )
+"""
+solve the OPF solution for the data file and reset generation; warm_start is
+an earlier OPF solution (e.g., of the unperturbed loads) to start from
+"""
+function put_system_at_equilibrium!(data, mp_file; warm_start=nothing)
+    (warm_start !== nothing) && set_opf_start_values!(data, warm_start)
 
     # Note, solve_opf turns qg into NaN since a DC model is used
     # result = solve_opf(mp_file, DCPPowerModel, lp_optimizer)
-    result = solve_model(data, DCPPowerModel, lp_optimizer, build_opf)
+    pm = instantiate_model(data, DCPPowerModel, build_opf)
+    result = with_lp_optimizer("gurobi") do lp_optimizer
+        JuMP.set_optimizer(pm.model, lp_optimizer)
+        (warm_start !== nothing) && set_lp_warm_start!(pm.model)
+        optimize_model!(pm)
+    end
+    # Inner models built from data would also pick up the start values
+    (warm_start !== nothing) && strip_opf_start_values!(data)
 
     # Replace generator values to put power model in equilibrium
     for (i, gen) in result["solution"]["gen"]
@@ -73,18 +81,179 @@ function put_system_at_equilibrium!(data, mp_file)
     end
 
     (DEBUG) && println("Put system in equilibrium")
+    return result["solution"]
+end
+
+"""
+Gurobi only uses the start values of a MIP; pass those of an LP as a primal
+start (PStart), which is used with LPWarmStart; the method is left to Gurobi
+"""
+function set_lp_warm_start!(model)
+    for x in JuMP.all_variables(model)
+        value = JuMP.start_value(x)
+        (value === nothing) && continue
+        MOI.set(model, Gurobi.VariableAttribute("PStart"), x, value)
+    end
+    JuMP.set_optimizer_attribute(model, "LPWarmStart", 2)
+end
+
+""" set the start values of the OPF variables (see PowerModels comp_start_value) """
+function set_opf_start_values!(data, solution)
+    for (i, gen) in solution["gen"]
+        data["gen"][string(i)]["pg_start"] = gen["pg"]
+    end
+    for (i, bus) in get(solution, "bus", Dict())
+        data["bus"][string(i)]["va_start"] = bus["va"]
+    end
+    for (i, br) in get(solution, "branch", Dict())
+        data["branch"][string(i)]["p_start"] = br["pf"]
+    end
+end
+
+""" remove the start values set by set_opf_start_values! """
+function strip_opf_start_values!(data)
+    foreach(gen -> delete!(gen, "pg_start"), values(data["gen"]))
+    foreach(bus -> delete!(bus, "va_start"), values(data["bus"]))
+    foreach(br -> delete!(br, "p_start"), values(data["branch"]))
+end
+
+""" data class that holds a copy-on-write view of an interdicted case """
+struct InterdictedCase
+    data::Dict
+    br_status::Dict{Int,Int}
+    gen_status::Dict{Int,Int}
+    loads::Dict{Int,Float64}
+    setpoints::Dict # generators without a setpoint are held at zero
+    topology # TopologyTracker that may hold the status of the case, or nothing
+end
+
+InterdictedCase(data::Dict; topology=nothing) =
+    InterdictedCase(data, Dict(), Dict(), Dict(), Dict(), topology)
+
+""" data class that holds the active status of the components of a case """
+struct TopologyStatus
+    bus::Dict{Int,Bool}
+    branch::Dict{Int,Bool}
+    gen::Dict{Int,Bool}
+    load::Dict{Int,Bool}
+    shunt::Dict{Int,Bool}
 end
 
-""" deepcopy and turn-off interdicted components """
-function interdict_components(case_data, generators::Vector, lines::Vector;
-    make_deepcopy=true)
-    case = make_deepcopy ? deepcopy(case_data) : case_data
+""" record interdicted components in an overlay of case_data (no deepcopy) """
+function interdict_components(case_data::Dict, generators::Vector, lines::Vector;
+    topology=nothing)
+    case = InterdictedCase(case_data; topology=topology)
     for i in generators
-        case["gen"][string(i)]["gen_status"] = 0
+        case.gen_status[to_index(i)] = 0
     end
     for i in lines
-        case["branch"][string(i)]["br_status"] = 0
+        case.br_status[to_index(i)] = 0
     end
-    PowerModels.propagate_topology_status!(case)
     return case
 end
+
+""" overlay version of modify_loads! """
+function modify_loads!(case::InterdictedCase, loads::Dict)
+    for (i, load) in loads
+        case.loads[to_index(i)] = load
+    end
+end
+
+""" overlay version of setting the generator setpoints """
+function modify_setpoints!(case::InterdictedCase, setpoints::Dict)
+    merge!(case.setpoints, setpoints)
+end
+
+branch_status(case::InterdictedCase, i::Int) =
+    get(() -> case.data["branch"][string(i)]["br_status"], case.br_status, i)
+
+gen_status(case::InterdictedCase, i::Int) =
+    get(() -> case.data["gen"][string(i)]["gen_status"], case.gen_status, i)
+
+load_pd(case::InterdictedCase, i::Int) =
+    get(() -> case.data["load"][string(i)]["pd"], case.loads, i)
+
+"""
+Read-only replacement of PowerModels.propagate_topology_status! for an
+overlay. Returns the active status of each component in ref: an island is only
+kept if it has an active generator and a load (or shunt) to serve, and every
+component of a kept island is active. Unlike PowerModels, it does not switch
+off dangling buses (with one branch and no generator, load or shunt) and their
+branches, it ignores storage, and an island stays active whether it has the
+reference bus or not. None of these change the load shed or the flows of the
+DC load shed model. If the case has a topology tracker with exactly its
+components removed, its status is used instead of a full search.
+"""
+function propagate_topology_status(case::InterdictedCase, ref::Dict)
+    t = case.topology
+    if t !== nothing && t.ref === ref &&
+       tracks(t, [l for (l, s) in case.br_status if s == 0],
+           [g for (g, s) in case.gen_status if s == 0])
+        return topology_status(t)
+    end
+
+    adjacent = Dict(i => Int[] for i in keys(ref[:bus]))
+    for (l, branch) in ref[:branch]
+        (branch_status(case, l) == 0) && continue
+        push!(adjacent[branch["f_bus"]], branch["t_bus"])
+        push!(adjacent[branch["t_bus"]], branch["f_bus"])
+    end
+
+    bus = Dict{Int,Bool}()
+    for root in keys(ref[:bus])
+        haskey(bus, root) && continue
+
+        # Collect the island that contains root
+        island, Q = [root], [root]
+        bus[root] = false
+        while !isempty(Q)
+            v = pop!(Q)
+            for w in adjacent[v]
+                haskey(bus, w) && continue
+                bus[w] = false
+                push!(island, w)
+                push!(Q, w)
+            end
+        end
+
+        has_gen = any(gen_status(case, g) != 0
+                      for i in island for g in ref[:bus_gens][i])
+        has_load = any(!isempty(ref[:bus_loads][i]) ||
+                       !isempty(ref[:bus_shunts][i]) for i in island)
+        for i in island
+            bus[i] = has_gen && has_load
+        end
+    end
+
+    return TopologyStatus(
+        bus,
+        Dict(l => branch_status(case, l) != 0 &&
+                  bus[br["f_bus"]] && bus[br["t_bus"]]
+             for (l, br) in ref[:branch]),
+        Dict(i => gen_status(case, i) != 0 && bus[gen["gen_bus"]]
+             for (i, gen) in ref[:gen]),
+        Dict(i => bus[load["load_bus"]] for (i, load) in ref[:load]),
+        Dict(i => bus[shunt["shunt_bus"]] for (i, shunt) in ref[:shunt])
+    )
+end
+
+"""
+Build a PowerModels data dict from the overlay for instantiate_model. Only the
+component dicts are copied (not the full case), then the topology is propagated
+"""
+function materialize(case::InterdictedCase)::Dict
+    data = copy(case.data)
+    for comp in ("bus", "branch", "gen", "load", "shunt", "dcline", "storage", "switch")
+        haskey(data, comp) || continue
+        data[comp] = Dict(i => copy(c) for (i, c) in data[comp])
+    end
+    for (i, status) in case.br_status
+        data["branch"][string(i)]["br_status"] = status
+    end
+    for (i, status) in case.gen_status
+        data["gen"][string(i)]["gen_status"] = status
+    end
+    modify_loads!(data, case.loads)
+    PowerModels.propagate_topology_status!(data)
+    return data
+end
@@ -4,14 +4,86 @@
 # 
 # Also contains functions to extract model values
 
-function get_lp_optimizer(solver)
+################################################################################
+# Gurobi environments
+################################################################################
+
+""" pool of Gurobi environments; an environment is used by one task at a time """
+mutable struct GurobiEnvPool
+    free::Dict{Int,Vector{Gurobi.Env}} # thread id of the last user => envs
+    lock::ReentrantLock
+    created::Threads.Atomic{Int}
+end
+
+const GRB_ENV_POOL = GurobiEnvPool(Dict(), ReentrantLock(), Threads.Atomic{Int}(0))
+
+""" check out an environment, preferring one last used by the same thread """
+function checkout_gurobi_env(pool::GurobiEnvPool=GRB_ENV_POOL)::Gurobi.Env
+    env = lock(pool.lock) do
+        tid = Threads.threadid()
+        if isempty(get(pool.free, tid, ()))
+            tid = findfirst(!isempty, pool.free)
+        end
+        return tid === nothing ? nothing : pop!(pool.free[tid])
+    end
+    (env !== nothing) && return env
+
+    Threads.atomic_add!(pool.created, 1)
+    return Gurobi.Env()
+end
+
+""" return an environment; no model built on it may be solved afterwards """
+function return_gurobi_env!(env::Gurobi.Env, pool::GurobiEnvPool=GRB_ENV_POOL)
+    lock(pool.lock) do
+        push!(get!(() -> Gurobi.Env[], pool.free, Threads.threadid()), env)
+    end
+end
+
+"""
+call f with a pooled environment and return it afterwards; f must free the
+models it built on it (see with_gurobi_model), or their finalizers could run
+later against an environment that is checked out by another task
+"""
+function with_gurobi_env(f::Function, pool::GurobiEnvPool=GRB_ENV_POOL)
+    env = checkout_gurobi_env(pool)
+    try
+        return f(env)
+    finally
+        return_gurobi_env!(env, pool)
+    end
+end
+
+""" call f with a direct Gurobi model on a pooled environment, then free it """
+function with_gurobi_model(f::Function)
+    return with_gurobi_env() do env
+        model = direct_model(Gurobi.Optimizer(env))
+        try
+            return f(model)
+        finally
+            finalize(JuMP.backend(model))
+        end
+    end
+end
+
+function Base.show(io::IO, pool::GurobiEnvPool)
+    free = lock(() -> sum(length, values(pool.free); init=0), pool.lock)
+    print(io, "GurobiEnvPool(created=$(pool.created[]), free=$(free))")
+end
+
+"""
+Return an LP optimizer. Without env, a gurobi optimizer checks out a pooled
+environment and keeps it for the life of its model; only the persistent inner
+models do this, and a case has at most one of those per concurrent caller
+"""
+function get_lp_optimizer(solver; env=nothing)
     if solver == "cplex"
         return JuMP.optimizer_with_attributes(
             () -> CPLEX.Optimizer(), "CPX_PARAM_SCRIND" => 0
         )
     elseif solver == "gurobi"
+        (env === nothing) && (env = checkout_gurobi_env())
         return JuMP.optimizer_with_attributes(
-            () -> Gurobi.Optimizer(Gurobi.Env()), "LogToConsole" => 0
+            () -> Gurobi.Optimizer(env), "LogToConsole" => 0
         )
     else
         @error "Unknown LP solver ($(solver)); must be one of [cplex|gurobi]"
@@ -19,6 +91,26 @@ function get_lp_optimizer(solver)
     end
 end
 
+"""
+call f with an LP optimizer; a gurobi one uses a pooled environment, and the
+models built with it are freed before the environment is returned
+"""
+function with_lp_optimizer(f::Function, solver)
+    (solver != "gurobi") && return f(get_lp_optimizer(solver))
+    return with_gurobi_env() do env
+        optimizers = Gurobi.Optimizer[]
+        lp_optimizer = JuMP.optimizer_with_attributes(
+            () -> push!(optimizers, Gurobi.Optimizer(env))[end],
+            "LogToConsole" => 0
+        )
+        try
+            return f(lp_optimizer)
+        finally
+            foreach(finalize, optimizers)
+        end
+    end
+end
+
 function init_models_data_ref(mp_file::String; do_perturb_loads=false)
     data = PowerModels.parse_file(mp_file; validate=false)
     PowerModels.make_per_unit!(data)
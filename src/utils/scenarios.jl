@@ -0,0 +1,93 @@
+# scenarios.jl
+#
+# Scenario sweeps over the generator ramping bound and the load perturbation.
+# The case is parsed, and its models are built, once; a scenario only changes
+# the loads (in place) and the ramping bound, which the persistent inner models
+# and the cut pool pick up as parameter updates of the models they keep.
+
+""" data class that holds a case that is shared by the scenarios of a sweep """
+mutable struct ScenarioCase
+    mp_file::String
+    data::Dict
+    ref::Dict
+    base_loads::Dict{String,Float64}
+    base_opf::Dict # OPF solution of the unperturbed loads
+end
+
+""" parse the case once and put the unperturbed loads at equilibrium """
+function init_scenario_case(mp_file::String)
+    data = PowerModels.parse_file(mp_file; validate=false)
+    PowerModels.make_per_unit!(data)
+    add_total_load_info!(data)
+    modify_generation_limits!(data)
+    base_opf = put_system_at_equilibrium!(data, mp_file)
+
+    ref = PowerModels.build_ref(data)[:it][:pm][:nw][0]
+    base_loads = Dict(i => load["pd"] for (i, load) in data["load"])
+    return ScenarioCase(mp_file, data, ref, base_loads, base_opf)
+end
+
+"""
+Perturb the loads of the case as init_models_data_ref does, and put the system
+at equilibrium starting from the OPF of the unperturbed loads. The unperturbed
+loads are used if no perturbation reaches an equilibrium in 10 tries
+"""
+function set_load_scenario!(sc::ScenarioCase; do_perturb_loads=true)
+    data = sc.data
+
+    solution = nothing
+    for _ in 1:(do_perturb_loads ? 10 : 0)
+        modify_loads!(data, sc.base_loads)
+        perturb_loads!(data; by=0.05)
+        add_total_load_info!(data)
+        try
+            solution = put_system_at_equilibrium!(data, sc.mp_file;
+                warm_start=sc.base_opf)
+            break
+        catch
+        end
+    end
+    if solution === nothing
+        modify_loads!(data, sc.base_loads)
+        add_total_load_info!(data)
+        put_system_at_equilibrium!(data, sc.mp_file; warm_start=sc.base_opf)
+    end
+
+    # Update the case in place, so the models built on it are kept
+    for (i, load) in sc.ref[:load]
+        load["pd"] = data["load"][string(i)]["pd"]
+    end
+    for (i, gen) in sc.ref[:gen]
+        gen["pg"] = data["gen"][string(i)]["pg"]
+    end
+    for (i, br) in sc.ref[:branch]
+        br["pf"] = data["branch"][string(i)]["pf"]
+    end
+
+    # Other loads are another inner problem for the inner cache and cut pool
+    lock(REF_LOCK) do
+        delete!(sc.ref, :case_id)
+        delete!(sc.ref, :case_hash)
+    end
+    refresh_inner_models!(data, sc.ref)
+
+    DEBUG && print_summary(data)
+    return sc
+end
+
+"""
+call f(sweep_args, data, ref, pc) for each ramping bound pc in percent_changes,
+under cliargs["exp_repeat"] load perturbations of one parsed case
+"""
+function sweep_scenarios(f::Function, cliargs::Dict, mp_file::String, percent_changes)
+    sc = init_scenario_case(mp_file)
+    sweep_args = copy(cliargs)
+    for r in 1:cliargs["exp_repeat"]
+        set_load_scenario!(sc; do_perturb_loads=cliargs["do_perturb_loads"])
+        for pc in percent_changes
+            DEBUG && println("Scenario $(r) with percent_change=$(pc)")
+            sweep_args["generator_ramping_bounds"] = pc
+            f(sweep_args, sc.data, sc.ref, pc)
+        end
+    end
+end
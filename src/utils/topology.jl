@@ -0,0 +1,242 @@
+# topology.jl
+#
+# Incremental version of propagate_topology_status for sequential attacks.
+# Branches and generators are removed one at a time (and restored in reverse
+# order with undo!), and only the islands that a removal changes are updated,
+# instead of recomputing the connectivity of the whole case per solve.
+
+""" data class that holds the islands and active status of an attacked case """
+mutable struct TopologyTracker
+    ref::Dict
+    adjacent::Dict{Int,Vector{Tuple{Int,Int}}} # bus => (branch, other bus)
+    off_branches::Set{Int}
+    off_gens::Set{Int}
+
+    island::Dict{Int,Int} # bus => island id
+    members::Dict{Int,Vector{Int}} # island id => buses
+    gens::Dict{Int,Int} # island id => number of active generators
+    loads::Dict{Int,Int} # island id => number of loads and shunts
+    next_id::Int
+
+    status::TopologyStatus
+    history::Vector{Tuple{Symbol,Int,Int}} # (:branch/:gen, id, split island)
+end
+
+""" tracker of the intact case of ref (all of its components are active) """
+function TopologyTracker(ref::Dict)
+    adjacent = Dict(i => Tuple{Int,Int}[] for i in keys(ref[:bus]))
+    for (l, branch) in ref[:branch]
+        push!(adjacent[branch["f_bus"]], (l, branch["t_bus"]))
+        push!(adjacent[branch["t_bus"]], (l, branch["f_bus"]))
+    end
+
+    t = TopologyTracker(ref, adjacent, Set(), Set(),
+        Dict(), Dict(), Dict(), Dict(), 0,
+        TopologyStatus(
+            Dict(i => false for i in keys(ref[:bus])),
+            Dict(l => false for l in keys(ref[:branch])),
+            Dict(i => false for i in keys(ref[:gen])),
+            Dict(i => false for i in keys(ref[:load])),
+            Dict(i => false for i in keys(ref[:shunt]))),
+        [])
+
+    for root in sort(collect(keys(ref[:bus])))
+        haskey(t.island, root) && continue
+        id = (t.next_id += 1)
+        t.members[id] = [root]
+        t.island[root] = id
+        Q = [root]
+        while !isempty(Q)
+            v = pop!(Q)
+            for (_, w) in adjacent[v]
+                haskey(t.island, w) && continue
+                t.island[w] = id
+                push!(t.members[id], w)
+                push!(Q, w)
+            end
+        end
+        _count_island!(t, id)
+        _set_island_status!(t, id)
+    end
+
+    return t
+end
+
+""" it_data with a tracker of its lines (a copy), unless it already has one """
+function with_topology(it_data::IterData, ref::Dict)
+    (it_data.topology !== nothing) && return it_data
+    it_data = copy(it_data)
+    it_data.topology = TopologyTracker(ref)
+    for l in it_data.lines
+        remove_branch!(it_data.topology, l)
+    end
+    return it_data
+end
+
+""" the active status of the components, as propagate_topology_status """
+function topology_status(t::TopologyTracker)
+    # Callers may modify the status they get
+    s = t.status
+    return TopologyStatus(copy(s.bus), copy(s.branch), copy(s.gen),
+        copy(s.load), copy(s.shunt))
+end
+
+""" true if the tracker has exactly the given branches and generators removed """
+function tracks(t::TopologyTracker, lines, generators)
+    return length(t.off_branches) == length(lines) &&
+           length(t.off_gens) == length(generators) &&
+           all(l -> in(to_index(l), t.off_branches), lines) &&
+           all(g -> in(to_index(g), t.off_gens), generators)
+end
+
+""" remove branch l; the island it was in is split if l was a bridge """
+function remove_branch!(t::TopologyTracker, l::Int)
+    if in(l, t.off_branches)
+        push!(t.history, (:none, l, 0))
+        return t
+    end
+    push!(t.off_branches, l)
+    t.status.branch[l] = false
+
+    branch = t.ref[:branch][l]
+    side = _split_side(t, branch["f_bus"], branch["t_bus"])
+    if side === nothing
+        push!(t.history, (:branch, l, 0))
+        return t
+    end
+
+    # The smaller side becomes a new island
+    old = t.island[branch["f_bus"]]
+    id = (t.next_id += 1)
+    moved = Set(side)
+    t.members[id] = side
+    filter!(i -> !in(i, moved), t.members[old])
+    for i in side
+        t.island[i] = id
+    end
+    _count_island!(t, old)
+    _count_island!(t, id)
+
+    was_active = t.status.bus[first(t.members[old])]
+    _set_island_status!(t, id)
+    (_island_active(t, old) != was_active) && _set_island_status!(t, old)
+
+    push!(t.history, (:branch, l, id))
+    return t
+end
+
+""" remove (turn off) generator g """
+function remove_gen!(t::TopologyTracker, g::Int)
+    if in(g, t.off_gens)
+        push!(t.history, (:none, g, 0))
+        return t
+    end
+    push!(t.off_gens, g)
+    _update_gen!(t, g, -1)
+    push!(t.history, (:gen, g, 0))
+    return t
+end
+
+""" restore the component of the last removal """
+function undo!(t::TopologyTracker)
+    kind, i, split = pop!(t.history)
+
+    if kind == :gen
+        delete!(t.off_gens, i)
+        _update_gen!(t, i, 1)
+    elseif kind == :branch
+        delete!(t.off_branches, i)
+        branch = t.ref[:branch][i]
+        f_bus, t_bus = branch["f_bus"], branch["t_bus"]
+        if split == 0
+            t.status.branch[i] = t.status.bus[f_bus] && t.status.bus[t_bus]
+            return t
+        end
+
+        # Merge the island split off by this branch back
+        old = (t.island[f_bus] == split) ? t.island[t_bus] : t.island[f_bus]
+        for v in t.members[split]
+            t.island[v] = old
+        end
+        append!(t.members[old], pop!(t.members, split))
+        delete!(t.gens, split)
+        delete!(t.loads, split)
+        _count_island!(t, old)
+        _set_island_status!(t, old)
+    end
+
+    return t
+end
+
+""" change the number of active generators of the island of generator g """
+function _update_gen!(t::TopologyTracker, g::Int, delta::Int)
+    id = t.island[t.ref[:gen][g]["gen_bus"]]
+    was_active = _island_active(t, id)
+    t.gens[id] += delta
+    if _island_active(t, id) == was_active
+        t.status.gen[g] = was_active && !in(g, t.off_gens)
+    else
+        _set_island_status!(t, id)
+    end
+end
+
+"""
+Search from both ends of a removed branch in turn. If the searches meet, the
+island is still connected (nothing); otherwise, the buses of the side whose
+search ends first, i.e., the smaller new island
+"""
+function _split_side(t::TopologyTracker, f_bus::Int, t_bus::Int)
+    (f_bus == t_bus) && return nothing
+    seen = (Set([f_bus]), Set([t_bus]))
+    queues = ([f_bus], [t_bus])
+    while true
+        for s in 1:2
+            isempty(queues[s]) && return collect(seen[s])
+            v = popfirst!(queues[s])
+            for (l, w) in t.adjacent[v]
+                in(l, t.off_branches) && continue
+                in(w, seen[3-s]) && return nothing
+                in(w, seen[s]) && continue
+                push!(seen[s], w)
+                push!(queues[s], w)
+            end
+        end
+    end
+end
+
+function _count_island!(t::TopologyTracker, id::Int)
+    ref = t.ref
+    buses = t.members[id]
+    t.gens[id] = count(g -> !in(g, t.off_gens), (g for i in buses for g in ref[:bus_gens][i]))
+    t.loads[id] = sum(length(ref[:bus_loads][i]) + length(ref[:bus_shunts][i])
+                      for i in buses; init=0)
+end
+
+# As in propagate_topology_status, an island is kept if it has a generator and
+# a load (or shunt) to serve
+_island_active(t::TopologyTracker, id::Int) = t.gens[id] > 0 && t.loads[id] > 0
+
+""" set the status of the components at the buses of island id """
+function _set_island_status!(t::TopologyTracker, id::Int)
+    ref, s = t.ref, t.status
+    active = _island_active(t, id)
+    for i in t.members[id]
+        s.bus[i] = active
+    end
+    for i in t.members[id]
+        for (l, _) in t.adjacent[i]
+            branch = ref[:branch][l]
+            s.branch[l] = !in(l, t.off_branches) &&
+                          s.bus[branch["f_bus"]] && s.bus[branch["t_bus"]]
+        end
+        for g in ref[:bus_gens][i]
+            s.gen[g] = active && !in(g, t.off_gens)
+        end
+        for d in ref[:bus_loads][i]
+            s.load[d] = active
+        end
+        for h in ref[:bus_shunts][i]
+            s.shunt[h] = active
+        end
+    end
+end
@@ -75,7 +75,8 @@ struct PermutationResults
     solution::PermutationSolution
 end
 
-PermutationResults() = PermutationResults(0, NaN, NaN, NaN, NaN, Solution())
+PermutationResults() = 
+    PermutationResults(0, NaN, NaN, NaN, NaN, PermutationSolution())
 
 function write_results(cliargs, results)
     case = first(split(cliargs["case"], "."))
@@ -106,7 +107,24 @@ mutable struct IterData
     prev_br_pf::Dict
     next_br_pf::Dict
     solution::Solution
+    topology # TopologyTracker of the lines removed so far, or nothing
 end
 
+IterData(lines, prev_loads, next_loads, prev_gen_setpoints, next_gen_setpoints,
+    prev_br_pf, next_br_pf, solution) =
+    IterData(lines, prev_loads, next_loads, prev_gen_setpoints,
+        next_gen_setpoints, prev_br_pf, next_br_pf, solution, nothing)
+
 IterData(loads, setpoints, pf) = 
-    IterData([], loads, Dict(), setpoints, Dict(), pf, pf, Solution())
\ No newline at end of file
+    IterData([], loads, Dict(), setpoints, Dict(), pf, pf, Solution())
+
+"""
+copy of it_data to branch from; its dicts are replaced, never mutated. The
+topology tracker is shared, as it is updated and undone along the branches
+"""
+Base.copy(it_data::IterData) = IterData(
+    copy(it_data.lines),
+    it_data.prev_loads, it_data.next_loads,
+    it_data.prev_gen_setpoints, it_data.next_gen_setpoints,
+    it_data.prev_br_pf, it_data.next_br_pf,
+    it_data.solution, it_data.topology)
@@ -23,3 +23,128 @@ function Base.iterate(it::TakeNItems, state)
 end
 
 take_n_items(iterable, n::Int=1) = TakeNItems(iterable, n)
+
+# Component indices may come in as strings (e.g., from the GUI or the CLI)
+to_index(i::Integer) = Int(i)
+to_index(i::AbstractString) = parse(Int, i)
+
+mutable struct _LRUEntry{K,V}
+    key::K
+    value::V
+    tick::Int
+end
+
+""" bounded cache with least-recently-used eviction and hit/miss counters """
+mutable struct LRUCache{K,V}
+    capacity::Int
+    entries::Dict{K,_LRUEntry{K,V}}
+    order::Dict{Int,_LRUEntry{K,V}} # tick of last use => entry
+    tick::Int
+    oldest::Int
+    hits::Int
+    misses::Int
+    lock::ReentrantLock
+end
+
+LRUCache{K,V}(capacity::Int) where {K,V} =
+    LRUCache{K,V}(capacity, Dict(), Dict(), 0, 1, 0, 0, ReentrantLock())
+
+Base.length(c::LRUCache) = length(c.entries)
+
+function Base.empty!(c::LRUCache)
+    lock(c.lock) do
+        empty!(c.entries)
+        empty!(c.order)
+        c.oldest = c.tick + 1
+    end
+    return c
+end
+
+"""
+Return the value cached for key, or compute it with f() and cache it. Keys are
+deepcopied when stored, so the caller may keep mutating its own copy. Safe to
+call from several threads; f() runs outside of the lock.
+"""
+function Base.get!(f::Function, c::LRUCache{K,V}, key) where {K,V}
+    value = lock(c.lock) do
+        entry = get(c.entries, key, nothing)
+        (entry === nothing) && return nothing
+        c.hits += 1
+        delete!(c.order, entry.tick)
+        entry.tick = (c.tick += 1)
+        c.order[entry.tick] = entry
+        return Some(entry.value)
+    end
+    (value !== nothing) && return something(value)
+
+    value = f()
+    lock(c.lock) do
+        c.misses += 1
+        (c.capacity <= 0 || haskey(c.entries, key)) && return
+        _insert!(c, key, value)
+    end
+    return value
+end
+
+""" Return the value cached for key, or default if there is none """
+function Base.get(c::LRUCache, key, default)
+    return lock(c.lock) do
+        entry = get(c.entries, key, nothing)
+        if entry === nothing
+            c.misses += 1
+            return default
+        end
+        c.hits += 1
+        delete!(c.order, entry.tick)
+        entry.tick = (c.tick += 1)
+        c.order[entry.tick] = entry
+        return entry.value
+    end
+end
+
+""" cache value for key; see get! """
+function Base.setindex!(c::LRUCache, value, key)
+    lock(c.lock) do
+        (c.capacity <= 0 || haskey(c.entries, key)) && return
+        _insert!(c, key, value)
+    end
+    return c
+end
+
+function _insert!(c::LRUCache{K,V}, key, value) where {K,V}
+    entry = _LRUEntry{K,V}(deepcopy(key), value, (c.tick += 1))
+    c.entries[entry.key] = entry
+    c.order[entry.tick] = entry
+
+    # Evict the least recently used entries
+    while length(c.entries) > c.capacity
+        while !haskey(c.order, c.oldest)
+            c.oldest += 1
+        end
+        evicted = pop!(c.order, c.oldest)
+        delete!(c.entries, evicted.key)
+    end
+end
+
+""" guards the entries created lazily in a ref (case id, inner models) """
+const REF_LOCK = ReentrantLock()
+
+"""
+Evaluate f on each of the items with Julia threads. The results are returned
+in the order of the items, so reductions over them match the serial loop.
+"""
+function threaded_map(f::Function, items)
+    items = collect(items)
+    results = Vector{Any}(undef, length(items))
+    Threads.@threads for j in eachindex(items)
+        results[j] = f(items[j])
+    end
+    return results
+end
+
+function Base.show(io::IO, c::LRUCache)
+    total = c.hits + c.misses
+    rate = total == 0 ? 0.0 : round(100 * c.hits / total; digits=2)
+    print(io, "LRUCache(size=$(length(c))/$(c.capacity), ",
+        "hits=$(c.hits), misses=$(c.misses), hit rate=$(rate)%)")
+end
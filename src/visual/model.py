@@ -18,6 +18,11 @@ from juliacall import Main as jl, convert, VectorValue
 jl.seval("using PowerModels")
 jl.seval("using JuMP")
 jl.seval("using Gurobi")
+jl.seval("using Random")
+jl.seval("using LinearAlgebra")
+jl.seval("using SparseArrays")
+jl.seval("using SHA")
+jl.seval("using Serialization")
 jl.seval("using Combinatorics")
 
 jl.include("src/utils/cliparser.jl")
@@ -26,7 +31,10 @@ jl.include("src/utils/types.jl")
 jl.include("src/utils/utils.jl")
 jl.include("src/utils/ioutils.jl")
 jl.include("src/utils/datautils.jl")
+jl.include("src/utils/topology.jl")
 jl.include("src/utils/optimizationutils.jl")
+jl.include("src/utils/cutpool.jl")
+jl.include("src/utils/scenarios.jl")
 
 jl.include("src/outer/traditional.jl")
 jl.include("src/outer/permutation.jl")
@@ -35,11 +43,18 @@ jl.include("src/outer/enumeration.jl")
 jl.include("src/outer/greedy-criticality.jl")
 jl.include("src/outer/greedy-flow.jl")
 jl.include("src/outer/greedy-impact.jl")
+jl.include("src/outer/greedy-lazy.jl")
 jl.include("src/outer/ours.jl")
+jl.include("src/outer/ours-beam.jl")
+jl.include("src/outer/time-expanded.jl")
 
 jl.include("src/inner/pm_model.jl")
+jl.include("src/inner/dc-ls-persistent.jl")
+jl.include("src/inner/dc-ls-islands.jl")
 jl.include("src/inner/dc-ls-traditional.jl")
 jl.include("src/inner/dc-ls-permutation.jl")
+jl.include("src/inner/inner-cache.jl")
+jl.include("src/inner/dc-sensitivity.jl")
 
 # Network properties
 jl.include("src/network_properties/network-properties.jl")
@@ -72,6 +87,7 @@ class Model(Singleton):
 
         # Sequential Attack Cache
         self.it_data = []
+        self.topology = None
 
         # Simultanous Attack Cache
         self.simu_atk_cache = []
@@ -134,6 +150,9 @@ class Model(Singleton):
         next_it_data = jl.IterData(loads, setpoints, pf)
         self.it_data = [deepcopy(next_it_data)]
 
+        # Topology of the attack sequence; updated and undone one line at a time
+        self.topology = jl.TopologyTracker(self.pm_ref)
+
         # Also, add the same to the simu_atk_cache
         self.simu_atk_cache = [deepcopy({'loads':loads,'pg':setpoints,'p':pf})]
 
@@ -160,6 +179,7 @@ class Model(Singleton):
         self.atk_seq.clear()
         self.it_data = [self.it_data[0]] # keep initial state
         self.simu_atk_cache = [self.simu_atk_cache[0]] # keep initial state
+        self.topology = jl.TopologyTracker(self.pm_ref)
     
     def check_atk(self, eid):
         return eid not in self.atk_seq
@@ -168,9 +188,12 @@ class Model(Singleton):
         self.atk_seq.append(eid)
 
         # Sequential Attack
+        jl.remove_branch_b(self.topology, eid)
         prev_it_data = deepcopy(self.it_data[-1])
         prev_it_data.lines = deepcopy(self.atk_seq)
+        prev_it_data.topology = self.topology
         jl.solve_partial_interdiction(self.cliargs, self.pm_data, self.pm_ref, prev_it_data)
+        prev_it_data.topology = None # the saved states do not copy the tracker
         self.it_data.append(prev_it_data)
 
         # Simultaneous Attack
@@ -190,6 +213,7 @@ class Model(Singleton):
             return 
 
         eid = self.atk_seq.pop()
+        jl.undo_b(self.topology)
         self.it_data.pop()
         self.simu_atk_cache.pop()
         return eid
@@ -0,0 +1,304 @@
+# runtests.jl
+#
+# Run with: julia --project test/runtests.jl
+
+using PowerModels
+using JuMP
+using Gurobi
+using Random
+using LinearAlgebra
+using SparseArrays
+using SHA
+using Serialization
+using Test
+
+using Combinatorics
+
+const SRC = joinpath(@__DIR__, "..", "src")
+
+include("$(SRC)/utils/cliparser.jl")
+include("$(SRC)/utils/types.jl")
+
+include("$(SRC)/utils/utils.jl")
+include("$(SRC)/utils/ioutils.jl")
+include("$(SRC)/utils/datautils.jl")
+include("$(SRC)/utils/topology.jl")
+include("$(SRC)/utils/optimizationutils.jl")
+include("$(SRC)/utils/cutpool.jl")
+include("$(SRC)/utils/scenarios.jl")
+
+include("$(SRC)/outer/traditional.jl")
+include("$(SRC)/outer/permutation.jl")
+include("$(SRC)/outer/enumeration.jl")
+
+include("$(SRC)/outer/greedy-criticality.jl")
+include("$(SRC)/outer/greedy-flow.jl")
+include("$(SRC)/outer/greedy-impact.jl")
+include("$(SRC)/outer/greedy-lazy.jl")
+include("$(SRC)/outer/ours.jl")
+include("$(SRC)/outer/ours-beam.jl")
+include("$(SRC)/outer/time-expanded.jl")
+
+include("$(SRC)/inner/pm_model.jl")
+include("$(SRC)/inner/dc-ls-persistent.jl")
+include("$(SRC)/inner/dc-ls-islands.jl")
+include("$(SRC)/inner/dc-ls-traditional.jl")
+include("$(SRC)/inner/dc-ls-permutation.jl")
+include("$(SRC)/inner/inner-cache.jl")
+include("$(SRC)/inner/dc-sensitivity.jl")
+
+PowerModels.silence()
+
+const DEBUG = false
+
+""" default cliargs for the tests, with outputs in a temporary directory """
+function test_cliargs(; kwargs...)
+    empty!(ARGS)
+    cliargs = parse_commandline()
+    cliargs["data_path"] = joinpath(@__DIR__, "..", "data") * "/"
+    cliargs["output_path"] = mktempdir() * "/"
+    cliargs["case"] = "pglib_opf_case14_ieee.m"
+    cliargs["do_perturb_loads"] = false
+    for (key, value) in kwargs
+        cliargs[string(key)] = value
+    end
+    validate_parameters(cliargs)
+    return cliargs
+end
+
+test_mp_file(cliargs) = get_filenames_with_paths(cliargs).mp_file
+
+""" id of the branch from bus f to bus t """
+test_branch(ref, f, t) = only(l for (l, br) in ref[:branch]
+                              if (br["f_bus"], br["t_bus"]) == (f, t))
+
+""" IterData of the case at equilibrium """
+function test_it_data(ref)
+    setpoints = Dict(i => gen["pg"] for (i, gen) in ref[:gen])
+    loads = Dict(i => load["pd"] for (i, load) in ref[:load])
+    pf = Dict(i => br["pf"] for (i, br) in ref[:branch])
+    return IterData(loads, setpoints, pf)
+end
+
+""" true if both dicts have approximately equal values; missing values are 0 """
+test_isapprox(a::Dict, b::Dict; atol=1e-6) =
+    all(isapprox(get(a, k, 0.0), get(b, k, 0.0); atol=atol)
+        for k in union(keys(a), keys(b)))
+
+@testset "enumeration shard" begin
+    # Many workers, so shard 1 only solves the first task
+    cliargs = test_cliargs(problem="enumeration", budget=1, line_budget=1,
+        workers=100, shard=1, seed=0)
+    run_enumeration_shard(cliargs, test_mp_file(cliargs))
+
+    dir = get_enumeration_shard_dir(cliargs, 0)
+    @test read_enumeration_done(dir) == Set([1])
+    solutions = read_enumeration_shards(dir)
+    @test collect(keys(solutions)) == [Any[[1]]]
+    @test solutions[Any[[1]]].load_shed >= 0.0
+end
+
+@testset "enumeration shard with coordinator cliargs" begin
+    # Options such as --prefilter reach the shard through cliargs.jls
+    coordinator = test_cliargs(problem="enumeration", budget=1, line_budget=1,
+        workers=100, prefilter=true)
+    dir = get_enumeration_shard_dir(coordinator, 0)
+    mkpath(dir)
+    serialize("$(dir)cliargs.jls", coordinator)
+    @test "$(dir)cliargs.jls" in get_shard_cmd(coordinator, 1, 0).exec
+
+    cliargs = merge(coordinator, Dict("prefilter" => false, "shard" => 1,
+        "seed" => 0, "shard_cliargs" => "$(dir)cliargs.jls"))
+    run_enumeration_shard(cliargs, test_mp_file(cliargs))
+    @test read_enumeration_done(dir) == Set([1])
+    @test only(values(read_enumeration_shards(dir))).load_shed >= 0.0
+end
+
+@testset "traditional sweep matches independent runs" begin
+    cliargs = test_cliargs(problem="traditional")
+    sweep = run_traditional_sweep(cliargs, test_mp_file(cliargs), 1:2)
+
+    for k in 1:2
+        empty!(CUT_POOL.cuts)
+        results = run_traditional(test_cliargs(problem="traditional",
+            budget=k, line_budget=k), test_mp_file(cliargs))
+        @test isapprox(sweep[k].objective_value, results.objective_value;
+            rtol=1e-3, atol=1e-4)
+    end
+end
+
+@testset "overlay topology matches PowerModels with islanding" begin
+    cliargs = test_cliargs()
+    data, ref = init_models_data_ref(test_mp_file(cliargs))
+    branch(f, t) = test_branch(ref, f, t)
+
+    # Islands bus 1 (the reference bus, a generator without load) and bus 8
+    # (a generator without load); both must be switched off
+    lines = [branch(1, 2), branch(1, 5), branch(7, 8)]
+    case = interdict_components(data, [], lines)
+    status = propagate_topology_status(case, ref)
+    pm_data = materialize(case)
+
+    for (i, load) in ref[:load]
+        @test status.load[i] == (pm_data["load"][string(i)]["status"] != 0)
+    end
+    for (i, gen) in ref[:gen]
+        @test status.gen[i] == (pm_data["gen"][string(i)]["gen_status"] != 0)
+    end
+    for (i, shunt) in ref[:shunt]
+        @test status.shunt[i] == (pm_data["shunt"][string(i)]["status"] != 0)
+    end
+    # PowerModels may also switch off dangling buses, which this keeps
+    for (i, bus) in ref[:bus]
+        (pm_data["bus"][string(i)]["bus_type"] != 4) && @test status.bus[i]
+    end
+    @test !status.bus[1] && !status.bus[8]
+
+    # The incremental tracker agrees with the full search
+    t = TopologyTracker(ref)
+    foreach(l -> remove_branch!(t, l), lines)
+    tracked = topology_status(t)
+    for name in fieldnames(TopologyStatus)
+        @test getfield(tracked, name) == getfield(status, name)
+    end
+    foreach(_ -> undo!(t), lines)
+    @test all(values(topology_status(t).bus))
+end
+
+@testset "lazy greedy matches exhaustive greedy" begin
+    for (problem, solve) in (("impact", solve_greedy_impact),
+                             ("criticality", solve_greedy_criticality))
+        cliargs = test_cliargs(problem=problem, budget=3, line_budget=3)
+        data, ref = init_models_data_ref(test_mp_file(cliargs))
+        exhaustive = solve(cliargs, data, ref)
+        lazy = solve(merge(cliargs, Dict("lazy_greedy" => true)), data, ref)
+
+        @test lazy.solution.best_permutation == exhaustive.solution.best_permutation
+        soln = only(values(lazy.solution.solutions))
+        @test soln.load_shed ≈
+              only(values(exhaustive.solution.solutions)).load_shed
+
+        # The exhaustive greedy evaluates every remaining line at each step
+        nb = length(ref[:branch])
+        @test soln.stats[:evaluations] <= sum(nb - s + 1 for s in 1:3)
+        @test soln.stats[:evaluations] + soln.stats[:skipped_evaluations] ==
+              sum(nb - s + 1 for s in 1:3)
+    end
+end
+
+@testset "persistent inner model matches the rebuilt model" begin
+    cliargs = test_cliargs()
+    data, ref = init_models_data_ref(test_mp_file(cliargs))
+    branch(f, t) = test_branch(ref, f, t)
+
+    # Islands bus 1, then bus 8 (closed-form islands), then cuts a line
+    steps = [[branch(1, 2)], [branch(1, 5)], [branch(7, 8)], [branch(2, 3)]]
+    it_data = test_it_data(ref)
+    for step in steps
+        it_data.lines = [it_data.lines..., step...]
+        solve(persistent) = get_permutation_inner_solution(
+            data, ref, [], it_data.lines, it_data;
+            solver="gurobi", persistent=persistent, cache=false)
+
+        rebuilt = solve(false)
+        # The second persistent solve reuses the islands of the first
+        for soln in (solve(true), solve(true))
+            @test soln.load_shed ≈ rebuilt.load_shed atol=1e-6
+            @test test_isapprox(soln.loads, rebuilt.loads)
+            @test test_isapprox(soln.pg, rebuilt.pg)
+            @test test_isapprox(soln.p, rebuilt.p)
+        end
+
+        # The next step starts from this one
+        it_data.prev_gen_setpoints = rebuilt.pg
+        it_data.prev_loads = rebuilt.loads
+    end
+
+    # The traditional inner problem, from the setpoints at equilibrium
+    setpoints = Dict(i => gen["pg"] for (i, gen) in ref[:gen])
+    solve_traditional_inner(persistent) = get_traditional_inner_solution(
+        data, ref, [], it_data.lines, setpoints;
+        solver="gurobi", persistent=persistent, cache=false)
+    persistent, rebuilt = solve_traditional_inner(true), solve_traditional_inner(false)
+    @test persistent.load_shed ≈ rebuilt.load_shed atol=1e-6
+    @test test_isapprox(persistent.pg, rebuilt.pg)
+    @test test_isapprox(persistent.p, rebuilt.p)
+
+    # run_dc_ls with the closed-form islands and with every island in the model
+    case = deepcopy(data)
+    foreach(l -> case["branch"][string(l)]["br_status"] = 0, it_data.lines)
+    PowerModels.propagate_topology_status!(case)
+    closed = run_dc_ls(deepcopy(case), ref)
+    modeled = run_dc_ls(deepcopy(case), ref; add_dc_lines_model=true)
+    @test closed.load_shed ≈ modeled.load_shed atol=1e-6
+    @test test_isapprox(closed.pg, modeled.pg)
+    @test test_isapprox(closed.p, modeled.p)
+end
+
+@testset "solve_orders matches independent solves of each order" begin
+    data, ref = init_models_data_ref(test_mp_file(test_cliargs()))
+    branch(f, t) = test_branch(ref, f, t)
+    lines = [branch(1, 2), branch(1, 5), branch(7, 8), branch(2, 3)]
+
+    # Without the cache, so that the independent solves are not memoized
+    set_inner_cache_capacity!(0)
+    try
+        for m in 1:2
+            cliargs = test_cliargs(problem="enumeration", budget=3,
+                line_budget=3, iterline_budget=m)
+            it_data = with_topology(test_it_data(ref), ref)
+            solutions = solve_orders(cliargs, data, ref, lines, 3, it_data)
+            @test length(solutions) == 24
+
+            # The tracker is back to the intact network
+            @test tracks(it_data.topology, [], [])
+
+            for (order, soln) in solutions
+                it = test_it_data(ref)
+                for step in order
+                    it = copy(it)
+                    it.lines = [it.lines..., step...]
+                    solve_partial_interdiction(cliargs, data, ref, it)
+                end
+                @test soln.load_shed ≈ it.solution.load_shed atol=1e-4
+            end
+        end
+    finally
+        set_inner_cache_capacity!(test_cliargs()["inner_cache_size"])
+    end
+end
+
+@testset "fixed partial interdiction matches the outer MILP" begin
+    cliargs = test_cliargs(problem="permutation", budget=2, line_budget=2)
+    data, ref = init_models_data_ref(test_mp_file(cliargs))
+    branch(f, t) = test_branch(ref, f, t)
+
+    fast, milp = test_it_data(ref), test_it_data(ref)
+    for l in [branch(1, 2), branch(2, 3)]
+        for (it, fast_path) in ((fast, true), (milp, false))
+            it.lines = [it.lines..., l]
+            solve_partial_interdiction(cliargs, data, ref, it; fast_path=fast_path)
+        end
+        @test fast.solution.load_shed ≈ milp.solution.load_shed atol=1e-3
+        @test sort(fast.solution.lines) == sort(milp.solution.lines)
+        @test test_isapprox(fast.prev_loads, milp.prev_loads; atol=1e-4)
+    end
+end
+
+@testset "screening does not change get_top_impacts" begin
+    data, ref = init_models_data_ref(test_mp_file(test_cliargs()))
+    it_data = test_it_data(ref)
+    it_data.lines = [test_branch(ref, 1, 2)]
+    candidates = [l for l in keys(ref[:branch]) if !in(l, it_data.lines)]
+
+    stats = Dict{Symbol,Any}()
+    top = get_top_impacts(data, ref, it_data, "gurobi"; n=3, stats=stats)
+    @test stats[:evaluations] + stats[:screened_evaluations] == length(candidates)
+
+    # Every candidate with an inner solve
+    impacts = Dict(i => get_permutation_inner_solution(
+        data, ref, [], [it_data.lines..., i], it_data; solver="gurobi").load_shed
+        for i in candidates)
+    best = sort(collect(values(impacts)), rev=true)[1:3]
+    @test [impacts[i] for i in top] ≈ best atol=1e-6
+end